@@ -1,11 +1,16 @@
 from __future__ import annotations
 
-import base64
-import json
+import asyncio
+import binascii
+import functools
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import Optional
 
-from fastapi import Header, HTTPException, status
+import orjson
+from fastapi import HTTPException, Request, status
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from .schemas import UserProfile
 
@@ -16,33 +21,131 @@ class AuthContext:
     profile: UserProfile
 
 
-def _decode_segment(segment: str) -> Optional[dict]:
+# JWT segments are unpadded base64url; translate to the standard alphabet with a byte table
+# and append the missing padding so binascii can decode without the base64 module's wrappers.
+_URLSAFE_TO_STANDARD = bytes.maketrans(b"-_", b"+/")
+_PADDING = (b"", b"===", b"==", b"=")
+
+
+_ANONYMOUS_CLAIMS: tuple[str, Optional[str], Optional[str]] = ("anonymous", None, None)
+
+
+def _decode_claims(segment: str) -> tuple[str, Optional[str], Optional[str]]:
+    """
+    Decode a JWT payload segment straight into the (id, email, name) claims used for the
+    UserProfile. orjson's C parser is faster than any Python-level scanner that would only
+    look for these keys, so the payload is parsed in full and discarded immediately.
+    """
     try:
-        padding = "=" * (-len(segment) % 4)
-        decoded = base64.urlsafe_b64decode(segment + padding).decode("utf-8")
-        return json.loads(decoded)
-    except Exception:
+        raw = segment.encode("ascii")
+        decoded = binascii.a2b_base64(raw.translate(_URLSAFE_TO_STANDARD) + _PADDING[len(raw) % 4])
+        # orjson parses the raw bytes directly, so there is no intermediate UTF-8 decode.
+        payload = orjson.loads(decoded)
+    except (orjson.JSONDecodeError, binascii.Error, ValueError):
+        return _ANONYMOUS_CLAIMS
+    if not isinstance(payload, dict):
+        return _ANONYMOUS_CLAIMS
+
+    get = payload.get
+    # Profile fields are optional strings; a claim of any other type is dropped rather than
+    # failing UserProfile validation inside the middleware (which runs for every request).
+    email = get("email")
+    name = get("name") or get("nickname")
+    return (
+        str(get("sub") or get("user_id") or "anonymous"),
+        email if isinstance(email, str) else None,
+        name if isinstance(name, str) else None,
+    )
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_token(token: str) -> tuple[str, Optional[str], Optional[str]]:
+    """
+    Decode the claims we care about from a bearer token. Cached because long-lived clients
+    resend the same token on every request.
+    """
+    first_dot = token.find(".")
+    if first_dot < 0:
+        return _ANONYMOUS_CLAIMS
+    second_dot = token.find(".", first_dot + 1)
+    return _decode_claims(token[first_dot + 1 : second_dot if second_dot >= 0 else len(token)])
+
+
+# Tokens above this size are decoded on a worker thread so large claim sets do not stall the loop;
+# smaller ones stay inline because the executor hop costs more than the decode itself.
+_INLINE_TOKEN_LIMIT = 2048
+_DECODE_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="jwt-decode")
+
+
+async def _resolve_context(authorization: Optional[str]) -> Optional[AuthContext]:
+    if not authorization:
+        return None
+    scheme, separator, token = authorization.partition(" ")
+    if not separator or scheme.lower() != "bearer":
         return None
 
+    token = token.strip()
+    if len(token) > _INLINE_TOKEN_LIMIT:
+        user_id, email, name = await asyncio.get_running_loop().run_in_executor(_DECODE_POOL, _parse_token, token)
+    else:
+        user_id, email, name = _parse_token(token)
+    return AuthContext(token=token, profile=UserProfile(id=user_id, email=email, name=name))
+
 
-async def get_current_user(authorization: str = Header(default=None)) -> AuthContext:
-    if not authorization or not authorization.lower().startswith("bearer "):
+# Resolved contexts keyed by the raw header bytes (bytes cache their own hash), so a repeat request
+# never materializes a str or touches base64/JSON. Entries expire after a TTL and the oldest entry
+# is evicted first once the cache is full.
+_CONTEXT_CACHE: dict[bytes, tuple[float, AuthContext]] = {}
+_CONTEXT_CACHE_SIZE = 4096
+_CONTEXT_CACHE_TTL = 300.0
+
+
+async def _context_for_header(raw: bytes) -> Optional[AuthContext]:
+    now = time.monotonic()
+    cached = _CONTEXT_CACHE.get(raw)
+    if cached is not None and cached[0] > now:
+        return cached[1]
+
+    context = await _resolve_context(raw.decode("latin-1"))
+    if context is not None:
+        _CONTEXT_CACHE.pop(raw, None)
+        _CONTEXT_CACHE[raw] = (now + _CONTEXT_CACHE_TTL, context)
+        if len(_CONTEXT_CACHE) > _CONTEXT_CACHE_SIZE:
+            del _CONTEXT_CACHE[next(iter(_CONTEXT_CACHE))]
+    return context
+
+
+class BearerAuthASGI:
+    """
+    Pure ASGI middleware that resolves the bearer token once per request and stores the
+    resulting AuthContext (or None) in scope["state"]["auth"]. Routes that require a user
+    enforce it through `require_auth` (the `Authed` dependency in main), so public endpoints
+    keep working unchanged.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            context: Optional[AuthContext] = None
+            for name, value in scope["headers"]:
+                if name == b"authorization":
+                    context = await _context_for_header(value)
+                    break
+            scope.setdefault("state", {})["auth"] = context
+
+        await self.app(scope, receive, send)
+
+
+def require_auth(request: Request) -> AuthContext:
+    """Return the AuthContext stored by BearerAuthASGI, or raise 401 when the request has none."""
+    context = request.scope.get("state", {}).get("auth")
+    if context is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Missing or invalid Authorization header",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    return context
 
-    token = authorization.split(" ", 1)[1].strip()
-    parts = token.split(".")
-    payload = _decode_segment(parts[1]) if len(parts) > 1 else None
-    if payload is None:
-        payload = {}
-
-    profile = UserProfile(
-        id=str(payload.get("sub") or payload.get("user_id") or "anonymous"),
-        email=payload.get("email"),
-        name=payload.get("name") or payload.get("nickname"),
-    )
-
-    return AuthContext(token=token, profile=profile)
@@ -1,9 +1,26 @@
 from __future__ import annotations
 
 import os
-from contextlib import contextmanager
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
 
-from sqlmodel import Session, SQLModel, create_engine
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+# Plain URLs are mapped onto the async drivers: psycopg 3 for Postgres, aiosqlite for SQLite.
+_ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgres": "postgresql+psycopg",
+    "postgresql": "postgresql+psycopg",
+}
+
+
+def _async_url(database_url: str) -> str:
+    scheme, separator, rest = database_url.partition("://")
+    return f"{_ASYNC_DRIVERS.get(scheme, scheme)}{separator}{rest}"
 
 
 def _build_engine():
@@ -11,37 +28,63 @@ def _build_engine():
     if not database_url:
         # Fallback to SQLite for situations where Postgres is unavailable.
         database_url = "sqlite:///./data/app.db"
+    database_url = _async_url(database_url)
 
-    connect_args = {}
+    # A larger compiled-statement cache keeps every query the app issues compiled once per process.
+    engine_kwargs: dict = {"echo": False, "pool_pre_ping": True, "query_cache_size": 1200}
     if database_url.startswith("sqlite"):
-        connect_args["check_same_thread"] = False
+        if ":memory:" in database_url or database_url.rstrip("/").endswith(":"):
+            # An in-memory database only exists on its connection, so every session must share it.
+            engine_kwargs["poolclass"] = StaticPool
+    else:
+        engine_kwargs["pool_size"] = int(os.getenv("DATABASE_POOL_SIZE", "10"))
+        engine_kwargs["max_overflow"] = int(os.getenv("DATABASE_MAX_OVERFLOW", "20"))
 
-    return create_engine(database_url, echo=False, pool_pre_ping=True, connect_args=connect_args)
+    engine = create_async_engine(database_url, **engine_kwargs)
+    if database_url.startswith("sqlite") and "poolclass" not in engine_kwargs:
+        event.listen(engine.sync_engine, "connect", _configure_sqlite_connection)
+    return engine
+
+
+def _configure_sqlite_connection(dbapi_connection, _connection_record) -> None:
+    """
+    WAL journaling lets readers (job polling, listings) run alongside the single writer instead of
+    being blocked for the length of every write transaction. Each commit appends its pages to the
+    log and SQLite folds the log back into the database at checkpoints; synchronous=NORMAL drops
+    the per-commit fsync (the database stays consistent, only the last commits before a power loss
+    can be lost).
+    """
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+    finally:
+        cursor.close()
 
 
 engine = _build_engine()
 
+# Attributes stay loaded after commit; with an AsyncSession an expired attribute would need
+# implicit IO on access, which is not allowed outside an await.
+SessionFactory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
 
-def init_db() -> None:
+async def init_db() -> None:
     """
     Create all tables if they do not exist. This runs on FastAPI startup.
     """
-    SQLModel.metadata.create_all(engine)
+    async with engine.begin() as connection:
+        await connection.run_sync(SQLModel.metadata.create_all)
 
 
-@contextmanager
-def session_scope() -> Session:
-    session = Session(engine)
+@asynccontextmanager
+async def session_scope() -> AsyncIterator[AsyncSession]:
+    session = SessionFactory()
     try:
         yield session
-        session.commit()
+        await session.commit()
     except Exception:
-        session.rollback()
+        await session.rollback()
         raise
     finally:
-        session.close()
-
-
-def get_session():
-    with Session(engine) as session:
-        yield session
+        await session.close()
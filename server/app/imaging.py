@@ -0,0 +1,86 @@
+"""
+Photo validation helpers that run inside worker processes.
+
+Everything here must stay importable without side effects so the process pool can
+pickle the functions by reference.
+"""
+from __future__ import annotations
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+# Validation is CPU-bound, so the default is one worker per core; lower it on hosts that share
+# cores with the reconstruction pipeline.
+DECODE_WORKERS = int(os.getenv("PHOTO_DECODE_WORKERS", "0")) or os.cpu_count() or 1
+JPEG_QUALITY = 90
+# Single-pass baseline encode: no extra Huffman-optimisation or progressive scans, 4:2:0 chroma.
+JPEG_SAVE_OPTIONS = {"quality": JPEG_QUALITY, "optimize": False, "progressive": False, "subsampling": "4:2:0"}
+
+_decode_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_decode_pool() -> ProcessPoolExecutor:
+    """Return the shared decode pool, creating it on first use."""
+    global _decode_pool
+    if _decode_pool is None:
+        # The pool starts once the server is already multithreaded (event loop, io executor, log
+        # listener); forking then could copy a held lock into the workers, so they are started
+        # from a clean forkserver (spawn where that is unavailable).
+        method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        _decode_pool = ProcessPoolExecutor(
+            max_workers=DECODE_WORKERS, mp_context=multiprocessing.get_context(method)
+        )
+    return _decode_pool
+
+
+def discard_decode_pool(pool: ProcessPoolExecutor) -> None:
+    """
+    Drop a pool that broke (a worker died, e.g. OOM on a huge image) so the next get_decode_pool()
+    starts fresh; a BrokenProcessPool never recovers on its own.
+    """
+    global _decode_pool
+    if _decode_pool is pool:
+        _decode_pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_decode_pool() -> None:
+    global _decode_pool
+    if _decode_pool is not None:
+        _decode_pool.shutdown(wait=False, cancel_futures=True)
+        _decode_pool = None
+
+
+class InvalidPhotoError(ValueError):
+    """The staged upload is not a readable image (the client's fault, unlike I/O errors)."""
+
+
+def prepare_photo(path: str) -> None:
+    """
+    Validate one staged upload in place. RGB JPEGs only get a header check and are kept
+    byte-for-byte; any other format or mode is decoded once and re-encoded as JPEG.
+    Raises InvalidPhotoError if the file is not a readable image; genuine I/O errors propagate.
+    """
+    # Imported here so only the decode workers load Pillow; the API process never touches it.
+    from PIL import Image
+
+    try:
+        with Image.open(path) as image:
+            image.verify()
+            if image.format == "JPEG" and image.mode == "RGB":
+                return
+
+        with Image.open(path) as image:
+            rgb = image.convert("RGB")
+    except OSError as exc:
+        # Pillow reports undecodable data as errno-less OSErrors; anything with an errno is real I/O.
+        if exc.errno is not None:
+            raise
+        raise InvalidPhotoError(str(exc)) from None
+    except Exception as exc:  # noqa: BLE001
+        raise InvalidPhotoError(str(exc)) from None
+    temporary = f"{path}.jpg"
+    rgb.save(temporary, format="JPEG", **JPEG_SAVE_OPTIONS)
+    os.replace(temporary, path)
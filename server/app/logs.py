@@ -0,0 +1,52 @@
+"""
+Non-blocking logging for the `app` package.
+
+Records are put on an in-memory queue by the calling code (usually the event loop) and written
+to stderr by a QueueListener thread, so a burst of pipeline output never blocks on terminal or
+pipe I/O inside a request or background task.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+LOG_LEVEL = os.getenv("APP_LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+_listener: Optional[QueueListener] = None
+
+
+def start_logging() -> None:
+    """Route the `app` logger through a queue drained by a background thread (idempotent)."""
+    global _listener
+    if _listener is not None:
+        return
+
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    app_logger = logging.getLogger("app")
+    app_logger.setLevel(LOG_LEVEL)
+    app_logger.addHandler(QueueHandler(log_queue))
+    app_logger.propagate = False
+
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+
+
+def stop_logging() -> None:
+    """Flush queued records and detach the queue handler."""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    _listener = None
+
+    app_logger = logging.getLogger("app")
+    for handler in [h for h in app_logger.handlers if isinstance(h, QueueHandler)]:
+        app_logger.removeHandler(handler)
+    app_logger.propagate = True
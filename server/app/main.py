@@ -1,21 +1,39 @@
 from __future__ import annotations
 
 import asyncio
-import io
+import fnmatch
+import hashlib
+import heapq
+import itertools
+import hmac
+import logging
 import os
+import re
+import shlex
 import shutil
+import stat
+import string
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import Annotated, Any, AsyncIterator, Awaitable, Callable, Coroutine, Optional, TypeVar
 from uuid import UUID
 
+import orjson
 from fastapi import Depends, FastAPI, HTTPException, Query, Request, Response, UploadFile, File, Form, status
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
-from sqlmodel import Session
-from PIL import Image
-
-from .auth import AuthContext, get_current_user
-from .database import get_session, init_db, session_scope
+from fastapi.responses import FileResponse, ORJSONResponse
+from pydantic import BaseModel, ValidationError
+
+from .auth import AuthContext, BearerAuthASGI, require_auth
+from .middleware import BodySizeLimitASGI
+from .database import SessionFactory, engine, init_db, session_scope
+from .imaging import InvalidPhotoError, discard_decode_pool, get_decode_pool, prepare_photo, shutdown_decode_pool
+from .logs import start_logging, stop_logging
 from .reconstruction_client import ReconstructionServiceClient, ReconstructionServiceError
 from .schemas import (
     DownloadLogRequest,
@@ -32,14 +50,69 @@ from .schemas import (
 )
 from .storage import AppStateStore
 from .storage_service import LocalStorageService, StoragePaths
-from .supabase_storage import SupabaseStorageClient, SupabaseStorageConfig
+from .supabase_storage import OBJECT_URI_PREFIX, SupabaseStorageClient, SupabaseStorageConfig, parse_object_uri
+
+logger = logging.getLogger(__name__)
+
+# Timestamps are stored as naive UTC; tag them explicitly so clients never read them as local time.
+_ORJSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+class AppJSONResponse(ORJSONResponse):
+    """Default response class: orjson with the app's datetime options, so every route emits the same format."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=_ORJSON_OPTIONS)
+
+
+def _warm_caches() -> None:
+    """Exercise the response serializers and body validators once so the first request is not the slow one."""
+    job = ReconstructionJob(owner_id="warmup", dataset_name="warmup", photo_count=1)
+    json_response(JobsListResponse(jobs=[job]))
+    json_response(UploadListResponse(uploads=[]))
+    JobStatusUpdateRequest.model_validate_json(b'{"status": "queued", "progress": 0.0}')
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI) -> AsyncIterator[None]:
+    # asyncio.to_thread / run_in_executor(None, ...) hops (photo and artifact file work) share one
+    # bounded pool of warm, named threads instead of the loop's implicitly created default executor.
+    start_logging()
+    io_executor = ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 2), thread_name_prefix="io")
+    asyncio.get_running_loop().set_default_executor(io_executor)
+    # The HTTP clients are closed on shutdown, so a later startup in the same process reopens them.
+    if reconstruction_client:
+        reconstruction_client.open()
+    if supabase_client:
+        supabase_client.open()
+    await init_db()
+    _warm_caches()
+    # Frees photos whose job folders were deleted while the server was down.
+    await asyncio.to_thread(storage_service.reclaim_photo_blobs)
+    yield
+    await reconstruction_runner.aclose()
+    await status_update_coalescer.aclose()
+    shutdown_decode_pool()
+    if reconstruction_client:
+        await reconstruction_client.aclose()
+    if supabase_client:
+        supabase_client.close()
+    await engine.dispose()
+    io_executor.shutdown(wait=False)
+    stop_logging()
+
 
 app = FastAPI(
     title="3D Building Generator – Local Backend",
     version="0.2.0",
     description="Mock backend used for local development of the 3D Building Generator app.",
+    default_response_class=AppJSONResponse,
+    lifespan=lifespan,
 )
 
+# All middlewares are pure ASGI; CORS is registered last so it wraps auth and answers preflights first.
+app.add_middleware(BodySizeLimitASGI)
+app.add_middleware(BearerAuthASGI)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -48,19 +121,182 @@ app.add_middleware(
 )
 
 
-@app.on_event("startup")
-def on_startup() -> None:
-    init_db()
+@asynccontextmanager
+async def _request_store() -> AsyncIterator[AppStateStore]:
+    """Open the request's AsyncSession and wrap it in a store."""
+    async with SessionFactory() as session:
+        yield AppStateStore(session)
+
+
+async def get_store() -> AsyncIterator[AppStateStore]:
+    async with _request_store() as store:
+        yield store
+
+
+@dataclass(slots=True)
+class AuthedStore:
+    context: AuthContext
+    store: AppStateStore
+
+
+async def resolve_authed_store(request: Request) -> AsyncIterator[AuthedStore]:
+    """
+    Single per-request dependency for authenticated routes: reads the AuthContext resolved by
+    BearerAuthASGI and opens the request's store.
+    """
+    context = require_auth(request)
+    async with _request_store() as store:
+        yield AuthedStore(context=context, store=store)
+
+
+Authed = Annotated[AuthedStore, Depends(resolve_authed_store, use_cache=True)]
+
 
+ModelT = TypeVar("ModelT", bound=BaseModel)
 
-def get_store(session: Session = Depends(get_session)) -> AppStateStore:
-    return AppStateStore(session)
+
+def json_body(model: type[ModelT]) -> Callable[[Request], Awaitable[ModelT]]:
+    """
+    Dependency that validates the raw request body with `model_validate_json`, skipping the
+    intermediate `json.loads` + dict validation FastAPI performs for declared body params.
+    """
+
+    async def _parse(request: Request) -> ModelT:
+        try:
+            return model.model_validate_json(await request.body())
+        except ValidationError as exc:
+            raise RequestValidationError(
+                [{**error, "loc": ("body", *error["loc"])} for error in exc.errors(include_url=False)]
+            ) from None
+
+    return _parse
+
+
+_JOB_ID_CACHE: dict[str, UUID] = {}
+_JOB_ID_CACHE_LIMIT = 4096
+
+
+def parse_job_id(value: str) -> UUID:
+    """
+    Parse the job_id path segment with a plain uuid.UUID call instead of Pydantic validation.
+    Recently seen ids are memoized; the cache simply stops growing once it is full.
+    """
+    try:
+        return _JOB_ID_CACHE[value]
+    except KeyError:
+        pass
+    try:
+        parsed = UUID(value)
+    except ValueError:
+        raise RequestValidationError(
+            [{"type": "uuid_parsing", "loc": ("path", "job_id"), "msg": "Input should be a valid UUID", "input": value}]
+        ) from None
+    if len(_JOB_ID_CACHE) < _JOB_ID_CACHE_LIMIT:
+        _JOB_ID_CACHE[value] = parsed
+    return parsed
+
+
+async def _require_owned_job(authed: AuthedStore, job_id: UUID, action: str) -> ReconstructionJob:
+    try:
+        return await authed.store.get_owned_job(job_id, authed.context.profile.id)
+    except KeyError:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found") from None
+    except PermissionError:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=f"Not allowed to {action} this job") from None
+
+
+def owned_job(action: str) -> Callable[[str, AuthedStore], Awaitable[ReconstructionJob]]:
+    """Dependency that loads the `job_id` path job and enforces that the caller owns it."""
+
+    async def _load(job_id: str, authed: Authed) -> ReconstructionJob:
+        return await _require_owned_job(authed, parse_job_id(job_id), action)
+
+    return _load
+
+
+OwnedJob = Annotated[ReconstructionJob, Depends(owned_job("access"))]
+ModifiableJob = Annotated[ReconstructionJob, Depends(owned_job("modify"))]
+
+
+def json_response(model: BaseModel, status_code: int = status.HTTP_200_OK) -> Response:
+    """
+    Serialize an already-validated model straight to JSON bytes. Returning a Response skips
+    FastAPI's response_model re-validation and jsonable_encoder; response_model stays on the
+    route for the OpenAPI schema. `model_dump()` keeps UUIDs, datetimes and enums as native
+    objects so orjson converts them on its C fast paths.
+    """
+    return AppJSONResponse(content=model.model_dump(), status_code=status_code)
+
+
+def polled_json_response(request: Request, content: Any) -> Response:
+    """
+    JSON response for the routes clients poll while a job runs. The body carries an ETag hashed
+    from the serialized bytes; a client that sends it back in If-None-Match gets an empty 304 until
+    something changes. `private, no-cache` makes caches revalidate instead of serving stale status.
+    """
+    body = orjson.dumps(content, option=_ORJSON_OPTIONS)
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        candidates = {candidate.strip().removeprefix("W/") for candidate in if_none_match.split(",")}
+        if etag in candidates or "*" in candidates:
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def json_body_openapi(model: type[BaseModel]) -> dict[str, Any]:
+    """OpenAPI requestBody for routes that read their body through `json_body`."""
+    schema = model.model_json_schema(ref_template="#/components/schemas/{model}")
+    schema.pop("$defs", None)
+    return {"requestBody": {"required": True, "content": {"application/json": {"schema": schema}}}}
 
 
 reconstruction_client = ReconstructionServiceClient.from_env()
 supabase_config = SupabaseStorageConfig.from_env()
 supabase_client = SupabaseStorageClient(supabase_config) if supabase_config else None
 storage_service = LocalStorageService(supabase_client)
+# Resolved once: download requests only need a prefix check against it.
+_MODELS_ROOT = StoragePaths.MODELS_DIR.resolve()
+
+
+# (delay in seconds since the previous step, status, progress, note)
+SIMULATION_STEPS: list[tuple[float, JobStatus, float, str]] = [
+    (3, JobStatus.PROCESSING, 0.2, "Running structure-from-motion"),
+    (4, JobStatus.MESHING, 0.6, "Generating dense mesh"),
+    (3, JobStatus.TEXTURING, 0.85, "Baking textures"),
+    (2, JobStatus.COMPLETED, 1.0, "Reconstruction complete"),
+]
+
+
+# Per-pipe read buffer for pipeline output, and how much stderr is folded into a failed job's notes.
+PIPE_READ_LIMIT = 16 * 1024
+STDERR_TAIL_LINES = 5
+
+
+COMMAND_FIELDS = frozenset({"job_id", "dataset_name", "photos_dir", "output_dir", "work_dir", "notes"})
+
+CommandSegment = tuple[str, Optional[str], Optional[str], Optional[str]]
+
+
+def _compile_command_template(template: str) -> list[list[CommandSegment]]:
+    """
+    Parse RECONSTRUCTION_COMMAND once: split it into argv words with shlex, then each word into
+    (literal, field, format_spec, conversion) segments so each job only substitutes values.
+    Splitting before substitution keeps every value a single argument, whatever it contains.
+    Unknown placeholders are rejected at startup rather than on the first job.
+    """
+    words = [list(string.Formatter().parse(word)) for word in shlex.split(template)]
+    fields = {field for segments in words for _, field, _, _ in segments if field is not None}
+    unknown = sorted(fields - COMMAND_FIELDS)
+    if unknown:
+        raise RuntimeError(
+            f"RECONSTRUCTION_COMMAND uses unknown placeholders {unknown}; available: {sorted(COMMAND_FIELDS)}"
+        )
+    if not words:
+        raise RuntimeError("RECONSTRUCTION_COMMAND is empty")
+    return words
 
 
 class ReconstructionRunner:
@@ -68,6 +304,7 @@ class ReconstructionRunner:
         self.storage = storage
         self.external_client = client
         self.command_template = os.getenv("RECONSTRUCTION_COMMAND")
+        self._command_words = _compile_command_template(self.command_template) if self.command_template else []
         self.artifact_patterns = [
             pattern.strip()
             for pattern in os.getenv(
@@ -76,8 +313,36 @@ class ReconstructionRunner:
             ).split(",")
             if pattern.strip()
         ]
+        # Patterns are split by shape so most names are classified without regex: exact file names go
+        # in a dict, "*.ext" patterns become an endswith() tuple, and only the remaining true globs are
+        # compiled into one alternation. Every entry keeps its pattern index as its priority.
+        self._literal_artifacts: dict[str, int] = {}
+        self._suffix_ranks: dict[str, int] = {}
+        wildcard_patterns: list[tuple[int, str]] = []
+        for index, pattern in enumerate(self.artifact_patterns):
+            if not any(char in pattern for char in "*?["):
+                self._literal_artifacts.setdefault(pattern, index)
+            elif pattern.startswith("*.") and not any(char in pattern[1:] for char in "*?["):
+                self._suffix_ranks.setdefault(pattern[1:], index)
+            else:
+                wildcard_patterns.append((index, pattern))
+        self._suffix_artifacts = tuple(self._suffix_ranks)
+        self._artifact_regex = (
+            re.compile("|".join(f"(?P<p{index}>{fnmatch.translate(pattern)})" for index, pattern in wildcard_patterns))
+            if wildcard_patterns
+            else None
+        )
         self.allow_simulation = os.getenv("RECONSTRUCTION_ALLOW_SIMULATION", "1") != "0"
         self._tasks: dict[UUID, asyncio.Task[None]] = {}
+        # Caps concurrently running submissions/pipelines; extra jobs wait their turn while queued.
+        self._inflight = asyncio.Semaphore(int(os.getenv("RECON_MAX_INFLIGHT", "8")))
+        self._heap: list[tuple[float, UUID, int, int]] = []
+        # Live simulation generation per job; numbers come from one process-wide sequence, so a
+        # rescheduled job never reuses the generation of entries still sitting in the heap.
+        self._generations: dict[UUID, int] = {}
+        self._generation_seq = itertools.count(1)
+        self._worker: asyncio.Task[None] | None = None
+        self._wakeup = asyncio.Event()
 
     def schedule(
         self, job_id: UUID, dataset_name: str, photos_dir: str, photo_count: int, notes: Optional[str]
@@ -85,28 +350,64 @@ class ReconstructionRunner:
         loop = asyncio.get_running_loop()
         if job_id in self._tasks:
             self._tasks[job_id].cancel()
+        # Invalidate any pending simulated steps for this job.
+        self._generations.pop(job_id, None)
 
         if self.external_client:
-            self._tasks[job_id] = loop.create_task(
+            self._start_task(
+                loop,
+                job_id,
                 self._submit_external_job(
                     job_id=job_id,
                     dataset_name=dataset_name,
                     photos_dir=photos_dir,
                     photo_count=photo_count,
                     notes=notes,
-                )
+                ),
             )
         elif self.command_template:
-            self._tasks[job_id] = loop.create_task(
-                self._run_pipeline(job_id=job_id, dataset_name=dataset_name, photos_dir=photos_dir, notes=notes or "")
+            self._start_task(
+                loop,
+                job_id,
+                self._run_pipeline(job_id=job_id, dataset_name=dataset_name, photos_dir=photos_dir, notes=notes or ""),
             )
         elif self.allow_simulation:
-            self._tasks[job_id] = loop.create_task(self._simulate(job_id))
+            self._schedule_simulation(job_id)
         else:
             raise RuntimeError(
                 "Reconstruction pipeline not configured. Set RECONSTRUCTION_COMMAND or enable simulation."
             )
 
+    async def aclose(self) -> None:
+        """Cancel in-flight jobs and the simulator on shutdown and wait for them to unwind."""
+        loop = asyncio.get_running_loop()
+        tasks = [task for task in self._tasks.values() if task.get_loop() is loop]
+        if self._worker is not None and self._worker.get_loop() is loop:
+            tasks.append(self._worker)
+            self._worker = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _start_task(self, loop: asyncio.AbstractEventLoop, job_id: UUID, work: Coroutine[Any, Any, None]) -> None:
+        task = loop.create_task(self._run_bounded(work))
+        self._tasks[job_id] = task
+
+        def _forget(done: asyncio.Task[None], job_id: UUID = job_id) -> None:
+            # Only evict our own entry; a resubmission may already have replaced it.
+            if self._tasks.get(job_id) is done:
+                del self._tasks[job_id]
+
+        task.add_done_callback(_forget)
+
+    async def _run_bounded(self, work: Coroutine[Any, Any, None]) -> None:
+        try:
+            async with self._inflight:
+                await work
+        finally:
+            # No-op once the coroutine has run; closes it cleanly if we were cancelled while queued.
+            work.close()
+
     async def _submit_external_job(
         self, job_id: UUID, dataset_name: str, photos_dir: str, photo_count: int, notes: Optional[str]
     ) -> None:
@@ -120,8 +421,7 @@ class ReconstructionRunner:
         )
 
         try:
-            result = await asyncio.to_thread(
-                self.external_client.submit_job,
+            result = await self.external_client.submit_job(
                 job_id=job_id,
                 dataset_name=dataset_name,
                 photo_count=photo_count,
@@ -150,12 +450,8 @@ class ReconstructionRunner:
             return
 
         if result.external_job_id:
-            def _attach() -> None:
-                with session_scope() as session:
-                    store = AppStateStore(session)
-                    store.attach_external_job_id(job_id, result.external_job_id)
-
-            await asyncio.to_thread(_attach)
+            async with session_scope() as session:
+                await AppStateStore(session).attach_external_job_id(job_id, result.external_job_id)
 
         if not result.accepted:
             await self._update_job(
@@ -178,48 +474,79 @@ class ReconstructionRunner:
         )
 
     async def _run_pipeline(self, job_id: UUID, dataset_name: str, photos_dir: str, notes: str) -> None:
-        command = self.command_template.format(
-            job_id=job_id,
-            dataset_name=dataset_name,
-            photos_dir=photos_dir,
-            output_dir=self.storage.prepare_work_dir(str(job_id)),
-            work_dir=self.storage.prepare_work_dir(str(job_id)),
-            notes=notes,
-        )
-
-        await self._update_job(
-            job_id,
-            JobStatusUpdateRequest(
-                status=JobStatus.PROCESSING,
-                progress=0.05,
-                notes="Reconstruction started",
+        # Clearing the work dir (thread pool) and the PROCESSING write (database) are independent,
+        # so neither waits for the other before the pipeline can start.
+        work_dir, _ = await asyncio.gather(
+            asyncio.to_thread(self.storage.prepare_work_dir, str(job_id)),
+            self._update_job(
+                job_id,
+                JobStatusUpdateRequest(
+                    status=JobStatus.PROCESSING,
+                    progress=0.05,
+                    notes="Reconstruction started",
+                ),
             ),
         )
-
-        process = await asyncio.create_subprocess_shell(
-            command,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE,
+        argv = self._render_command(
+            {
+                "job_id": job_id,
+                "dataset_name": dataset_name,
+                "photos_dir": photos_dir,
+                "output_dir": work_dir,
+                "work_dir": work_dir,
+                "notes": notes,
+            }
         )
-        stdout, stderr = await process.communicate()
 
-        if stdout:
-            print(f"[recon:{job_id}] stdout:\n{stdout.decode(errors='ignore')}")
-        if stderr:
-            print(f"[recon:{job_id}] stderr:\n{stderr.decode(errors='ignore')}")
+        # Exec'd directly: no /bin/sh in between, and dataset names or notes cannot inject shell syntax.
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *argv,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                limit=PIPE_READ_LIMIT,
+            )
+        except OSError as exc:
+            await self._update_job(
+                job_id,
+                JobStatusUpdateRequest(
+                    status=JobStatus.FAILED,
+                    progress=0.0,
+                    notes=f"Could not start pipeline {argv[0]!r}: {exc}",
+                ),
+            )
+            return
+        # Drain both pipes line by line while the pipeline runs so logs appear live and memory stays
+        # bounded by the longest line; only the last few stderr lines are kept for the failure note.
+        stderr_tail: deque[str] = deque(maxlen=STDERR_TAIL_LINES)
+        try:
+            await asyncio.gather(
+                self._drain_stream(job_id, "stdout", process.stdout),
+                self._drain_stream(job_id, "stderr", process.stderr, stderr_tail),
+            )
+            await process.wait()
+        except asyncio.CancelledError:
+            # Rescheduled or shutting down: do not leave the pipeline running unsupervised.
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
+            raise
 
         if process.returncode != 0:
+            notes = f"Pipeline exited with code {process.returncode}"
+            if stderr_tail:
+                notes = f"{notes}: " + "\n".join(stderr_tail)
             await self._update_job(
                 job_id,
                 JobStatusUpdateRequest(
                     status=JobStatus.FAILED,
                     progress=0.0,
-                    notes=f"Pipeline exited with code {process.returncode}",
+                    notes=notes,
                 ),
             )
             return
 
-        artifact = self._locate_artifact(self.storage.prepare_work_dir(str(job_id)))
+        artifact = await asyncio.to_thread(self._locate_artifact, work_dir)
         if not artifact:
             await self._update_job(
                 job_id,
@@ -231,7 +558,8 @@ class ReconstructionRunner:
             )
             return
 
-        stored_path = self.storage.persist_model_artifact(str(job_id), artifact)
+        # Copying a large artifact (and the optional Supabase upload) must not stall the loop.
+        stored_path = await asyncio.to_thread(self.storage.persist_model_artifact, str(job_id), artifact)
         await self._update_job(
             job_id,
             JobStatusUpdateRequest(
@@ -242,196 +570,493 @@ class ReconstructionRunner:
             ),
         )
 
-    async def _simulate(self, job_id: UUID) -> None:
-        steps = [
-            (3, JobStatus.PROCESSING, 0.2, "Running structure-from-motion"),
-            (4, JobStatus.MESHING, 0.6, "Generating dense mesh"),
-            (3, JobStatus.TEXTURING, 0.85, "Baking textures"),
-            (2, JobStatus.COMPLETED, 1.0, "Reconstruction complete"),
-        ]
-        for delay, status, progress, note in steps:
-            await asyncio.sleep(delay)
-            model_path = None
-            if status is JobStatus.COMPLETED:
-                model_path = self.storage.save_model_placeholder(str(job_id))
-            await self._update_job(
-                job_id,
-                JobStatusUpdateRequest(
-                    status=status,
-                    progress=progress,
-                    notes=note,
-                    model_file_name=model_path,
-                ),
-            )
+    async def _drain_stream(
+        self,
+        job_id: UUID,
+        name: str,
+        stream: asyncio.StreamReader | None,
+        tail: deque[str] | None = None,
+    ) -> None:
+        if stream is None:
+            return
+        while True:
+            try:
+                line = await stream.readline()
+            except ValueError:
+                # Line exceeded PIPE_READ_LIMIT; asyncio has already discarded it.
+                logger.warning("[recon:%s] %s: <line longer than %d bytes truncated>", job_id, name, PIPE_READ_LIMIT)
+                continue
+            if not line:
+                return
+            text = line.decode(errors="ignore").rstrip()
+            logger.info("[recon:%s] %s: %s", job_id, name, text)
+            if tail is not None and text:
+                tail.append(text)
+
+    async def _simulation_worker(self) -> None:
+        """
+        Single long-lived task that drives every simulated job. Due steps are popped from a heap of
+        (fire_at, job_id, step_index, generation) entries and applied together in one DB session.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            if not self._heap:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            delay = self._heap[0][0] - loop.time()
+            if delay > 0:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            now = loop.time()
+            due: list[tuple[UUID, int, int]] = []
+            while self._heap and self._heap[0][0] <= now:
+                _, job_id, step_index, generation = heapq.heappop(self._heap)
+                # Entries from a superseded schedule() call are dropped here instead of being removed eagerly.
+                if self._generations.get(job_id) == generation:
+                    due.append((job_id, step_index, generation))
+            if not due:
+                continue
+
+            missing: set[UUID] = set()
+            try:
+                missing = await self._apply_simulation_steps([(job_id, step_index) for job_id, step_index, _ in due])
+            except Exception:  # noqa: BLE001
+                logger.exception("[recon:simulator] failed to apply simulated steps")
+
+            for job_id, step_index, generation in due:
+                if self._generations.get(job_id) != generation:
+                    # Rescheduled while this step was being written.
+                    continue
+                next_index = step_index + 1
+                if job_id in missing or next_index >= len(SIMULATION_STEPS):
+                    self._generations.pop(job_id, None)
+                    continue
+                heapq.heappush(self._heap, (now + SIMULATION_STEPS[next_index][0], job_id, next_index, generation))
+
+    def _schedule_simulation(self, job_id: UUID) -> None:
+        loop = asyncio.get_running_loop()
+        generation = next(self._generation_seq)
+        self._generations[job_id] = generation
+        heapq.heappush(self._heap, (loop.time() + SIMULATION_STEPS[0][0], job_id, 0, generation))
+
+        if self._worker is None or self._worker.done() or self._worker.get_loop() is not loop:
+            self._wakeup = asyncio.Event()
+            self._worker = loop.create_task(self._simulation_worker())
+        self._wakeup.set()
+
+    async def _apply_simulation_steps(self, due: list[tuple[UUID, int]]) -> set[UUID]:
+        """
+        Apply due simulated steps in one transaction (a single commit for the whole tick); returns
+        the ids of jobs that no longer exist.
+        """
+        missing: set[UUID] = set()
+        async with session_scope() as session:
+            store = AppStateStore(session)
+            for job_id, step_index in due:
+                _, status, progress, note = SIMULATION_STEPS[step_index]
+                model_path = None
+                if status is JobStatus.COMPLETED:
+                    model_path = await asyncio.to_thread(self.storage.save_model_placeholder, str(job_id))
+                try:
+                    await store.stage_job_update(
+                        job_id,
+                        # Step values are constants; skip re-validating them on every tick.
+                        JobStatusUpdateRequest.model_construct(
+                            status=status,
+                            progress=progress,
+                            notes=note,
+                            model_file_name=model_path,
+                        ),
+                    )
+                except KeyError:
+                    # Job was removed (e.g. via /__reset) while it was still being simulated.
+                    missing.add(job_id)
+        return missing
 
     def _locate_artifact(self, directory: Path) -> Optional[Path]:
-        for pattern in self.artifact_patterns:
-            for candidate in Path(directory).rglob(pattern):
-                if candidate.is_file():
-                    return candidate
-        return None
+        """
+        Walk the work dir once and return the first file matching the highest-priority pattern
+        (patterns are ordered by preference, as in RECONSTRUCTION_ARTIFACT_PATTERN).
+        """
+        best: Optional[tuple[int, str]] = None
+        # Pipelines repeat the same file names in every numbered model folder (sparse/0, sparse/1, ...),
+        # so each distinct name is ranked once per walk.
+        ranks: dict[str, Optional[int]] = {}
+        pending = [os.fspath(directory)]
+        while pending:
+            current = pending.pop()
+            subdirs: list[str] = []
+            try:
+                with os.scandir(current) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                            continue
+                        name = entry.name
+                        try:
+                            rank = ranks[name]
+                        except KeyError:
+                            rank = ranks[name] = self._artifact_rank(name)
+                        if rank is None or not entry.is_file():
+                            continue
+                        if best is None or rank < best[0]:
+                            best = (rank, entry.path)
+                            if rank == 0:
+                                return Path(entry.path)
+            except OSError:
+                continue
+            pending.extend(reversed(subdirs))
+        return Path(best[1]) if best else None
+
+    def _render_command(self, values: dict[str, Any]) -> list[str]:
+        argv: list[str] = []
+        for segments in self._command_words:
+            parts: list[str] = []
+            for literal, field, spec, conversion in segments:
+                parts.append(literal)
+                if field is None:
+                    continue
+                value = values[field]
+                if conversion == "r":
+                    value = repr(value)
+                elif conversion == "a":
+                    value = ascii(value)
+                elif conversion == "s":
+                    value = str(value)
+                parts.append(format(value, spec or ""))
+            argv.append("".join(parts))
+        return argv
+
+    def _artifact_rank(self, name: str) -> Optional[int]:
+        """Priority of the best artifact pattern matching `name`, or None if nothing matches."""
+        rank = self._literal_artifacts.get(name)
+        if name.endswith(self._suffix_artifacts):
+            for suffix, suffix_rank in self._suffix_ranks.items():
+                if (rank is None or suffix_rank < rank) and name.endswith(suffix):
+                    rank = suffix_rank
+        if self._artifact_regex is not None:
+            match = self._artifact_regex.match(name)
+            if match:
+                regex_rank = int(match.lastgroup[1:])
+                if rank is None or regex_rank < rank:
+                    rank = regex_rank
+        return rank
 
     async def _update_job(self, job_id: UUID, payload: JobStatusUpdateRequest) -> None:
-        def _sync_update() -> None:
-            with session_scope() as session:
-                store = AppStateStore(session)
-                store.update_job(job_id, payload)
-
-        await asyncio.to_thread(_sync_update)
+        async with session_scope() as session:
+            await AppStateStore(session).update_job(job_id, payload)
 
 
 reconstruction_runner = ReconstructionRunner(storage_service, reconstruction_client)
 
+_TERMINAL_STATUSES = frozenset({JobStatus.COMPLETED, JobStatus.FAILED})
+_JOB_UPDATE_FIELDS = tuple(JobStatusUpdateRequest.model_fields)
+
+
+class JobUpdateCoalescer:
+    """
+    Write-behind buffer for progress-only status callbacks. Updates for the same job are merged in
+    memory and all pending jobs are written in one transaction per flush interval; terminal or
+    artifact-bearing updates go straight to the database after folding in anything still pending.
+    """
+
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self._pending: dict[UUID, JobStatusUpdateRequest] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._flusher: Optional[asyncio.Task] = None
+
+    def submit(self, job_id: UUID, payload: JobStatusUpdateRequest) -> None:
+        self._ensure_loop_state()
+        self._pending[job_id] = self._merge(self._pending.get(job_id), payload)
+        if self._flusher is None or self._flusher.done():
+            self._flusher = asyncio.get_running_loop().create_task(self._flush_later())
+
+    async def write_now(self, job_id: UUID, payload: JobStatusUpdateRequest) -> None:
+        """Raises KeyError if the job no longer exists."""
+        self._ensure_loop_state()
+        # Holding the flush lock keeps an in-flight batch from committing a stale progress afterwards.
+        async with self._lock:
+            payload = self._merge(self._pending.pop(job_id, None), payload)
+            async with session_scope() as session:
+                await AppStateStore(session).update_job(job_id, payload)
+
+    async def flush(self) -> None:
+        if not self._pending:
+            return
+        self._ensure_loop_state()
+        async with self._lock:
+            batch, self._pending = self._pending, {}
+            try:
+                async with session_scope() as session:
+                    store = AppStateStore(session)
+                    for job_id, payload in batch.items():
+                        try:
+                            await store.stage_job_update(job_id, payload)
+                        except KeyError:
+                            # Job was removed between the callback and the flush.
+                            continue
+            except Exception:  # noqa: BLE001
+                logger.exception("[recon:callback] failed to flush %d coalesced status updates", len(batch))
+
+    async def aclose(self) -> None:
+        if self._flusher is not None and not self._flusher.done():
+            self._flusher.cancel()
+            await asyncio.gather(self._flusher, return_exceptions=True)
+        self._flusher = None
+        await self.flush()
+
+    async def _flush_later(self) -> None:
+        # Keep going while updates are pending: callbacks that arrive during a flush land in the
+        # fresh _pending dict and would otherwise wait for the next callback (or shutdown).
+        while self._pending:
+            await asyncio.sleep(self.interval)
+            # Shielded so aclose() cancelling this task cannot abort a batch mid-commit.
+            await asyncio.shield(self.flush())
+
+    def _ensure_loop_state(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._lock = asyncio.Lock()
+            self._flusher = None
+
+    @staticmethod
+    def _merge(
+        older: Optional[JobStatusUpdateRequest], newer: JobStatusUpdateRequest
+    ) -> JobStatusUpdateRequest:
+        """Fold `newer` into the pending `older` in place; the coalescer owns its pending updates."""
+        if older is None:
+            return newer
+        for field in _JOB_UPDATE_FIELDS:
+            value = getattr(newer, field)
+            if value is not None:
+                setattr(older, field, value)
+        return older
+
+
+# 0 disables coalescing and writes every callback immediately.
+status_update_coalescer = JobUpdateCoalescer(float(os.getenv("RECON_CALLBACK_FLUSH_SECONDS", "0.5")))
+
+
+class LargeFileResponse(FileResponse):
+    """
+    FileResponse for multi-hundred-MB model artifacts: 1 MiB reads instead of Starlette's 64 KiB
+    cut the number of threadpool reads and ASGI sends per download. Servers that implement the
+    ASGI pathsend extension already get a zero-copy send from the base class.
+    """
+
+    chunk_size = 1024 * 1024
+
+
+_HEALTH_BYTES = b'{"status":"ok"}'
+
 
 @app.get("/health")
-def healthcheck() -> dict[str, str]:
-    return {"status": "ok"}
+async def healthcheck() -> Response:
+    # Probed at high frequency by load balancers; serve a prebuilt body without any encoding work.
+    return Response(content=_HEALTH_BYTES, media_type="application/json")
 
 
 @app.get("/me", response_model=UserProfile)
 async def get_profile(
-    context: AuthContext = Depends(get_current_user),
-    store: AppStateStore = Depends(get_store),
-) -> UserProfile:
-    store.upsert_user(context.profile)
-    return context.profile
+    authed: Authed,
+) -> Response:
+    await authed.store.upsert_user(authed.context.profile)
+    return json_response(authed.context.profile)
+
+
+# A fresh decode pool is tried once more after a worker crash before the upload fails with 503.
+DECODE_POOL_ATTEMPTS = 2
+
+
+async def _stage_photos(files: list[UploadFile]) -> tuple[Path, list[Path]]:
+    """
+    Stream the uploads into a staging directory, then validate them in the process pool.
+    Only file paths cross the process boundary; photo bytes never sit in Python memory.
+    """
+    try:
+        staging_dir, staged = await asyncio.to_thread(
+            storage_service.stage_uploads, [upload_file.file for upload_file in files]
+        )
+    finally:
+        # The multipart spools are not needed once staged; closing them now frees the rolled-over
+        # temp files instead of keeping a second on-disk copy of every photo until the response.
+        for upload_file in files:
+            upload_file.file.close()
+    try:
+        loop = asyncio.get_running_loop()
+        for attempt in range(DECODE_POOL_ATTEMPTS):
+            pool = get_decode_pool()
+            try:
+                # One task per photo: a path is cheap to pickle, and the pool balances the occasional
+                # transcode against the many header-only checks better than fixed batches would.
+                await asyncio.gather(*(loop.run_in_executor(pool, prepare_photo, str(path)) for path in staged))
+                break
+            except BrokenProcessPool:
+                # A dead worker breaks the whole pool; replace it and retry (prepare_photo is idempotent).
+                discard_decode_pool(pool)
+                logger.warning("photo decode pool broke (attempt %d/%d)", attempt + 1, DECODE_POOL_ATTEMPTS)
+        else:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Photo validation is temporarily unavailable; please retry.",
+            )
+    except BaseException:
+        storage_service.discard_staging(staging_dir)
+        raise
+    return staging_dir, staged
+
+
+async def _save_photos(job_id: str, staging_dir: Path, staged: list[Path]) -> str:
+    """
+    Store validated photos under data/uploads/<job_id>/ and return that directory. Hashing dominates
+    and hashlib releases the GIL, so each photo is stored on the shared io executor concurrently.
+    """
+    job_dir, targets = await asyncio.to_thread(storage_service.photo_targets, job_id, len(staged))
+    await asyncio.gather(
+        *(asyncio.to_thread(storage_service.store_photo, photo, target) for photo, target in zip(staged, targets))
+    )
+    await asyncio.to_thread(storage_service.discard_staging, staging_dir)
+    return str(job_dir)
 
 
 @app.post("/uploads", response_model=UploadResponse, status_code=status.HTTP_201_CREATED)
 async def create_upload(
+    authed: Authed,
     dataset_name: str = Form(...),
     notes: str | None = Form(default=None),
     files: list[UploadFile] = File(default_factory=list),
-    context: AuthContext = Depends(get_current_user),
-    store: AppStateStore = Depends(get_store),
-) -> UploadResponse:
+) -> Response:
     if not files:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="At least one photo is required.")
 
-    images = []
-    for upload_file in files:
-        contents = await upload_file.read()
-        try:
-            image = Image.open(io.BytesIO(contents)).convert("RGB")
-        except Exception as exc:  # noqa: BLE001
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid image upload.") from exc
-        images.append(image)
-
-    store.upsert_user(context.profile)
-    payload = UploadCreateRequest(dataset_name=dataset_name, photo_count=len(images), notes=notes)
-    response = store.create_upload(owner_id=context.profile.id, payload=payload)
+    try:
+        staging_dir, staged = await _stage_photos(files)
+    except InvalidPhotoError as exc:
+        # Only undecodable photos are the client's fault; disk or pool failures stay server errors.
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid image upload.") from exc
 
-    photos_dir, _ = storage_service.save_photos(str(response.job.id), images)
-    updated_upload = store.update_upload_media(
+    try:
+        await authed.store.upsert_user(authed.context.profile)
+        payload = UploadCreateRequest(dataset_name=dataset_name, photo_count=len(staged), notes=notes)
+        response = await authed.store.create_upload(owner_id=authed.context.profile.id, payload=payload)
+        photos_dir = await _save_photos(str(response.job.id), staging_dir, staged)
+    except BaseException:
+        storage_service.discard_staging(staging_dir)
+        raise
+
+    updated_upload = await authed.store.update_upload_media(
         response.upload.id,
-        photo_count=len(images),
+        photo_count=len(staged),
         photos_dir=photos_dir,
     )
     response = UploadResponse(upload=updated_upload, job=response.job)
 
-    reconstruction_runner.schedule(response.job.id, dataset_name, photos_dir, len(images), notes)
-    job = store.get_job(response.job.id)
-    return UploadResponse(upload=updated_upload, job=job)
+    # schedule() only queues background work, so the job created above is still current.
+    reconstruction_runner.schedule(response.job.id, dataset_name, photos_dir, len(staged), notes)
+    return json_response(response, status_code=status.HTTP_201_CREATED)
+
+
+# Listings return everything by default; `limit` returns only the newest N entries.
+MAX_LIST_LIMIT = 500
 
 
 @app.get("/uploads", response_model=UploadListResponse)
 async def list_uploads(
-    context: AuthContext = Depends(get_current_user),
-    store: AppStateStore = Depends(get_store),
-) -> UploadListResponse:
-    return store.list_uploads(owner_id=context.profile.id)
+    authed: Authed,
+    limit: Optional[int] = Query(default=None, ge=1, le=MAX_LIST_LIMIT),
+) -> Response:
+    return AppJSONResponse(
+        content=await authed.store.list_uploads_payload(owner_id=authed.context.profile.id, limit=limit)
+    )
 
 
 @app.get("/jobs", response_model=JobsListResponse)
 async def list_jobs(
-    context: AuthContext = Depends(get_current_user),
-    store: AppStateStore = Depends(get_store),
+    request: Request,
+    authed: Authed,
     status_filter: Optional[JobStatus] = Query(default=None, alias="status"),
-) -> JobsListResponse:
-    return store.list_jobs(owner_id=context.profile.id, status=status_filter)
+    limit: Optional[int] = Query(default=None, ge=1, le=MAX_LIST_LIMIT),
+) -> Response:
+    return polled_json_response(
+        request,
+        await authed.store.list_jobs_payload(owner_id=authed.context.profile.id, status=status_filter, limit=limit),
+    )
 
 
 @app.get("/jobs/{job_id}", response_model=ReconstructionJob)
 async def get_job(
-    job_id: UUID,
-    context: AuthContext = Depends(get_current_user),
-    store: AppStateStore = Depends(get_store),
-):
-    try:
-        job = store.get_job(job_id)
-    except KeyError:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found") from None
-
-    if job.owner_id != context.profile.id:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allowed to access this job")
-    return job
+    request: Request,
+    job: OwnedJob,
+) -> Response:
+    return polled_json_response(request, job.model_dump())
 
 
-@app.post("/jobs/{job_id}/status", response_model=ReconstructionJob)
+@app.post(
+    "/jobs/{job_id}/status",
+    response_model=ReconstructionJob,
+    openapi_extra=json_body_openapi(JobStatusUpdateRequest),
+)
 async def update_job(
-    job_id: UUID,
-    payload: JobStatusUpdateRequest,
-    context: AuthContext = Depends(get_current_user),
-    store: AppStateStore = Depends(get_store),
-):
-    try:
-        job = store.get_job(job_id)
-    except KeyError:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found") from None
-
-    if job.owner_id != context.profile.id:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allowed to modify this job")
-
+    job: ModifiableJob,
+    authed: Authed,
+    payload: JobStatusUpdateRequest = Depends(json_body(JobStatusUpdateRequest)),
+) -> Response:
     try:
-        return store.update_job(job_id, payload)
+        return json_response(await authed.store.update_job(job.id, payload))
     except KeyError:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found") from None
 
 
-@app.post("/downloads", response_model=DownloadLogResponse)
+@app.post("/downloads", response_model=DownloadLogResponse, openapi_extra=json_body_openapi(DownloadLogRequest))
 async def log_download(
-    payload: DownloadLogRequest,
-    context: AuthContext = Depends(get_current_user),
-    store: AppStateStore = Depends(get_store),
-) -> DownloadLogResponse:
+    authed: Authed,
+    payload: DownloadLogRequest = Depends(json_body(DownloadLogRequest)),
+) -> Response:
+    await _require_owned_job(authed, payload.job_id, "modify")
     try:
-        job = store.get_job(payload.job_id)
+        return json_response(await authed.store.log_download(payload))
     except KeyError:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found") from None
 
-    if job.owner_id != context.profile.id:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allowed to modify this job")
 
-    try:
-        return store.log_download(payload)
-    except KeyError:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found") from None
+# Read once at import; callbacks arrive every few seconds per active job.
+_CALLBACK_TOKEN = os.getenv("RECON_CALLBACK_TOKEN")
+_CALLBACK_TOKEN_BYTES = _CALLBACK_TOKEN.encode() if _CALLBACK_TOKEN else b""
 
 
 def _verify_callback_token(request: Request) -> None:
-    expected = os.getenv("RECON_CALLBACK_TOKEN")
-    if not expected:
+    if not _CALLBACK_TOKEN:
         return
 
     header = request.headers.get("Authorization")
-    if not header or not header.lower().startswith("bearer "):
+    if not header or header[:7].lower() != "bearer ":
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing callback Authorization header")
 
-    token = header.split(" ", 1)[1].strip()
-    if token != expected:
+    token = header[7:].strip()
+    if not hmac.compare_digest(token.encode(), _CALLBACK_TOKEN_BYTES):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid callback token")
 
 
 @app.post("/internal/reconstruction/status", status_code=status.HTTP_204_NO_CONTENT, include_in_schema=False)
 async def reconstruction_status_callback(
-    payload: ReconstructionStatusCallback,
     request: Request,
+    payload: ReconstructionStatusCallback = Depends(json_body(ReconstructionStatusCallback)),
     store: AppStateStore = Depends(get_store),
 ) -> Response:
     _verify_callback_token(request)
 
     try:
-        store.get_job(payload.job_id)
+        await store.get_job(payload.job_id)
     except KeyError:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found") from None
 
@@ -456,16 +1081,25 @@ async def reconstruction_status_callback(
         notes = f"{payload.message or 'Artifact retrieval failed'} – {artifact_error}"
         model_file_name = None
 
+    # Every field comes from the already validated callback payload (or our own failure note).
+    update = JobStatusUpdateRequest.model_construct(
+        status=status_override,
+        progress=progress_override,
+        notes=notes,
+        model_file_name=model_file_name,
+    )
+    # Plain progress ticks are batched; anything that finishes the job or carries a model is written now.
+    if (
+        status_update_coalescer.interval > 0
+        and model_file_name is None
+        and status_override not in _TERMINAL_STATUSES
+        and (progress_override is None or progress_override < 1.0)
+    ):
+        status_update_coalescer.submit(payload.job_id, update)
+        return Response(status_code=status.HTTP_204_NO_CONTENT)
+
     try:
-        store.update_job(
-            payload.job_id,
-            JobStatusUpdateRequest(
-                status=status_override,
-                progress=progress_override,
-                notes=notes,
-                model_file_name=model_file_name,
-            ),
-        )
+        await status_update_coalescer.write_now(payload.job_id, update)
     except KeyError:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found") from None
 
@@ -474,40 +1108,29 @@ async def reconstruction_status_callback(
 
 @app.post("/__reset", status_code=status.HTTP_204_NO_CONTENT, include_in_schema=False)
 async def reset_state(
-    context: AuthContext = Depends(get_current_user),
-    store: AppStateStore = Depends(get_store),
+    authed: Authed,
 ) -> Response:
     """Development helper – clears the database tables."""
-    if not context.profile.id.startswith("auth0|"):
+    if not authed.context.profile.id.startswith("auth0|"):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient privileges")
-    store.reset()
+    await authed.store.reset()
+    await asyncio.to_thread(storage_service.reclaim_photo_blobs)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
 @app.get("/jobs/{job_id}/artifact")
 async def download_model_artifact(
-    job_id: UUID,
-    context: AuthContext = Depends(get_current_user),
-    store: AppStateStore = Depends(get_store),
+    job: OwnedJob,
 ) -> Response:
-    try:
-        job = store.get_job(job_id)
-    except KeyError:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found") from None
-
-    if job.owner_id != context.profile.id:
-        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not allowed to access this job")
-
     if not job.model_file_name:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Model not available yet")
 
     # If stored in Supabase, return a signed URL redirect
-    if job.model_file_name.startswith("supabase://"):
+    if job.model_file_name.startswith(OBJECT_URI_PREFIX):
         if not supabase_client:
             raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Supabase not configured")
-        bucket_and_key = job.model_file_name.removeprefix("supabase://")
         try:
-            bucket, key = bucket_and_key.split("/", 1)
+            bucket, key = parse_object_uri(job.model_file_name)
         except ValueError:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid Supabase model path") from None
         if bucket != supabase_client.config.bucket:
@@ -526,15 +1149,22 @@ async def download_model_artifact(
         candidate = StoragePaths.MODELS_DIR / candidate
 
     resolved = candidate.resolve()
-    models_root = StoragePaths.MODELS_DIR.resolve()
-    if models_root not in resolved.parents and resolved != models_root:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid model path")
+    try:
+        resolved.relative_to(_MODELS_ROOT)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid model path") from None
 
-    if not resolved.exists() or not resolved.is_file():
+    try:
+        stat_result = resolved.stat()
+    except OSError:
+        stat_result = None
+    if stat_result is None or not stat.S_ISREG(stat_result.st_mode):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Model file not found on disk")
 
-    return FileResponse(
+    # Handing over the stat result saves FileResponse a second os.stat on the threadpool.
+    return LargeFileResponse(
         path=str(resolved),
         media_type="application/octet-stream",
         filename=resolved.name,
+        stat_result=stat_result,
     )
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import os
+
+from fastapi import HTTPException, status
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class BodySizeLimitASGI:
+    """
+    Pure ASGI middleware that rejects request bodies larger than `max_body_bytes`.
+    Declared Content-Length is checked up front; chunked bodies are counted as they stream in.
+    """
+
+    def __init__(self, app: ASGIApp, max_body_bytes: int | None = None) -> None:
+        self.app = app
+        self.max_body_bytes = max_body_bytes or int(os.getenv("MAX_REQUEST_BODY_BYTES", str(512 * 1024 * 1024)))
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        for name, value in scope["headers"]:
+            if name == b"content-length":
+                try:
+                    declared = int(value)
+                except ValueError:
+                    declared = 0
+                if declared > self.max_body_bytes:
+                    # Same {"detail": ...} body the streamed rejection below gets from FastAPI.
+                    response = JSONResponse(
+                        {"detail": "Request body too large"},
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    )
+                    await response(scope, receive, send)
+                    return
+                break
+
+        received = 0
+        limit = self.max_body_bytes
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # FastAPI re-raises HTTPExceptions coming from body parsing, so this becomes a 413.
+                    raise HTTPException(
+                        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                        detail="Request body too large",
+                    )
+            return message
+
+        await self.app(scope, limited_receive, send)
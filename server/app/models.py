@@ -1,25 +1,64 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID, uuid4
 
-from sqlalchemy import Column, Enum
-from sqlmodel import Field, SQLModel
+from sqlalchemy import Column, DateTime, Enum, Index
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql.expression import FunctionElement
+from sqlmodel import Field, Relationship, SQLModel
 
 from .schemas import JobStatus
 
 
+class utc_now(FunctionElement):
+    """Current UTC time as a naive timestamp, evaluated by the database (SQLAlchemy's utcnow recipe)."""
+
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(utc_now)
+def _utc_now_default(element, compiler, **kw) -> str:
+    return "CURRENT_TIMESTAMP"
+
+
+@compiles(utc_now, "postgresql")
+def _utc_now_postgresql(element, compiler, **kw) -> str:
+    return "TIMEZONE('utc', CURRENT_TIMESTAMP)"
+
+
+@compiles(utc_now, "sqlite")
+def _utc_now_sqlite(element, compiler, **kw) -> str:
+    # CURRENT_TIMESTAMP only has second precision in SQLite.
+    return "STRFTIME('%Y-%m-%d %H:%M:%f', 'now')"
+
+
+def _db_timestamp(*, onupdate: bool = False) -> Column:
+    # `default` puts the expression inline in the INSERT, so tables created before server_default
+    # existed still get a value; eager_defaults on the model reads it back with RETURNING.
+    return Column(
+        DateTime,
+        nullable=False,
+        index=True,
+        default=utc_now(),
+        server_default=utc_now(),
+        onupdate=utc_now() if onupdate else None,
+    )
+
+
 class User(SQLModel, table=True):
-    id: str = Field(primary_key=True, index=True)
+    id: str = Field(primary_key=True)
     email: Optional[str] = Field(default=None, index=True)
     name: Optional[str] = None
     created_at: datetime = Field(default_factory=datetime.utcnow)
 
 
 class Upload(SQLModel, table=True):
-    id: UUID = Field(default_factory=uuid4, primary_key=True, index=True)
-    user_id: str = Field(foreign_key="user.id", index=True)
+    id: UUID = Field(default_factory=uuid4, primary_key=True)
+    user_id: str = Field(foreign_key="user.id")
     dataset_name: str
     photo_count: int
     submitted_at: datetime = Field(default_factory=datetime.utcnow, index=True)
@@ -27,8 +66,12 @@ class Upload(SQLModel, table=True):
 
 
 class Job(SQLModel, table=True):
-    id: UUID = Field(default_factory=uuid4, primary_key=True, index=True)
-    user_id: str = Field(foreign_key="user.id", index=True)
+    # Fetch the database-generated timestamps in the INSERT/UPDATE itself (RETURNING), so committed
+    # jobs can be serialized without a refresh.
+    __mapper_args__ = {"eager_defaults": True}
+
+    id: UUID = Field(default_factory=uuid4, primary_key=True)
+    user_id: str = Field(foreign_key="user.id")
     upload_id: UUID = Field(foreign_key="upload.id", index=True)
     dataset_name: str
     photo_count: int
@@ -40,11 +83,32 @@ class Job(SQLModel, table=True):
     progress: float = Field(default=0.0)
     notes: Optional[str] = None
     model_file_name: Optional[str] = None
-    created_at: datetime = Field(default_factory=datetime.utcnow, index=True)
-    updated_at: datetime = Field(default_factory=datetime.utcnow, index=True)
+    # Stamped by the database clock: no per-write Python timestamp, and consistent across workers.
+    created_at: Optional[datetime] = Field(default=None, sa_column=_db_timestamp())
+    updated_at: Optional[datetime] = Field(default=None, sa_column=_db_timestamp(onupdate=True))
+
+    # lazy="raise": an AsyncSession cannot lazy-load, so queries that need the events must
+    # request them with selectinload (one IN query per batch of jobs). The relationships are
+    # spelled out with sa_relationship because this module uses postponed annotations.
+    download_events: List["DownloadEvent"] = Relationship(
+        sa_relationship=relationship(
+            "DownloadEvent", back_populates="job", lazy="raise", order_by="DownloadEvent.timestamp"
+        )
+    )
 
 
 class DownloadEvent(SQLModel, table=True):
-    id: UUID = Field(default_factory=uuid4, primary_key=True, index=True)
+    id: UUID = Field(default_factory=uuid4, primary_key=True)
     job_id: UUID = Field(foreign_key="job.id", index=True)
     timestamp: datetime = Field(default_factory=datetime.utcnow)
+
+    job: Optional[Job] = Relationship(sa_relationship=relationship("Job", back_populates="download_events"))
+
+
+# Listing endpoints filter by owner (and optionally status) and sort newest first; these let the
+# planner read exactly one owner's rows, already in order, from the index instead of scanning and
+# sorting. They also serve plain user_id lookups, so user_id carries no index of its own.
+# create_all() only adds them to newly created tables, so existing databases need them created by hand.
+Index("ix_upload_user_submitted", Upload.user_id, Upload.submitted_at.desc())
+Index("ix_job_user_created", Job.user_id, Job.created_at.desc())
+Index("ix_job_user_status", Job.user_id, Job.status, Job.created_at.desc())
@@ -1,13 +1,16 @@
 from __future__ import annotations
 
-import json
 import os
-import urllib.error
-import urllib.request
 from dataclasses import dataclass
 from typing import Any, Optional
 from uuid import UUID
 
+import httpx
+import orjson
+
+
+_JSON_CONTENT_TYPE = {"Content-Type": "application/json"}
+
 
 class ReconstructionServiceError(RuntimeError):
     """Raised when the external reconstruction service returns an error or cannot be reached."""
@@ -22,14 +25,28 @@ class SubmitJobResult:
 
 class ReconstructionServiceClient:
     """
-    Minimal HTTP client that talks to the external reconstruction service defined in
-    docs/algorithm_service_interface.md.
+    Minimal async HTTP client that talks to the external reconstruction service defined in
+    docs/algorithm_service_interface.md. A single httpx.AsyncClient keeps connections to the
+    service alive across job submissions.
     """
 
     def __init__(self, base_url: str, token: str, timeout: int = 15) -> None:
         self.base_url = base_url.rstrip("/")
         self.token = token
         self.timeout = timeout
+        self._client: Optional[httpx.AsyncClient] = None
+        self.open()
+
+    def open(self) -> None:
+        """(Re)create the HTTP client after aclose(); the app calls this on every startup."""
+        if self._client is not None and not self._client.is_closed:
+            return
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=self.timeout,
+            headers={"Authorization": f"Bearer {self.token}", "Accept": "application/json"},
+            limits=httpx.Limits(max_keepalive_connections=32),
+        )
 
     @classmethod
     def from_env(cls) -> Optional["ReconstructionServiceClient"]:
@@ -39,7 +56,7 @@ class ReconstructionServiceClient:
             return None
         return cls(base_url, token)
 
-    def submit_job(
+    async def submit_job(
         self,
         *,
         job_id: UUID,
@@ -55,38 +72,39 @@ class ReconstructionServiceClient:
             "photos_dir": photos_dir,
             "notes": notes,
         }
-        response = self._request("POST", "/jobs", payload)
+        response = await self._request("POST", "/jobs", payload)
 
         accepted = bool(response.get("accepted", False))
         external_job_id = response.get("external_job_id")
         message = response.get("message")
         return SubmitJobResult(accepted=accepted, external_job_id=external_job_id, message=message)
 
-    def fetch_status(self, job_id: UUID) -> dict[str, Any]:
+    async def fetch_status(self, job_id: UUID) -> dict[str, Any]:
         path = f"/jobs/{job_id}"
-        return self._request("GET", path, None)
+        return await self._request("GET", path, None)
 
-    def _request(self, method: str, path: str, payload: Optional[dict[str, Any]]) -> dict[str, Any]:
-        url = f"{self.base_url}{path}"
-        data = json.dumps(payload).encode("utf-8") if payload is not None else None
-
-        headers = {
-            "Authorization": f"Bearer {self.token}",
-            "Accept": "application/json",
-        }
-        if payload is not None:
-            headers["Content-Type"] = "application/json"
-
-        request = urllib.request.Request(url, data=data, headers=headers, method=method.upper())
+    async def aclose(self) -> None:
+        await self._client.aclose()
 
+    async def _request(self, method: str, path: str, payload: Optional[dict[str, Any]]) -> dict[str, Any]:
+        try:
+            # Bodies are encoded and decoded with orjson, like the API's own responses.
+            if payload is None:
+                response = await self._client.request(method.upper(), path)
+            else:
+                response = await self._client.request(
+                    method.upper(), path, content=orjson.dumps(payload), headers=_JSON_CONTENT_TYPE
+                )
+        except httpx.RequestError as exc:  # covers timeouts / DNS failures
+            raise ReconstructionServiceError(f"Failed to reach reconstruction service: {exc}") from exc
+
+        if response.is_error:
+            raise ReconstructionServiceError(
+                f"{response.status_code} error from reconstruction service: {response.text}"
+            )
+        if not response.content:
+            return {}
         try:
-            with urllib.request.urlopen(request, timeout=self.timeout) as response:
-                body = response.read()
-                if not body:
-                    return {}
-                return json.loads(body.decode("utf-8"))
-        except urllib.error.HTTPError as exc:
-            detail = exc.read().decode(errors="ignore") if exc.fp else exc.reason
-            raise ReconstructionServiceError(f"{exc.code} error from reconstruction service: {detail}") from exc
-        except urllib.error.URLError as exc:  # covers timeouts / DNS failures
-            raise ReconstructionServiceError(f"Failed to reach reconstruction service: {exc.reason}") from exc
+            return orjson.loads(response.content)
+        except orjson.JSONDecodeError as exc:
+            raise ReconstructionServiceError(f"Invalid JSON from reconstruction service: {exc}") from exc
@@ -1,65 +1,141 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Optional
+from typing import Any, Optional
 from uuid import UUID
 
-from sqlmodel import Session, select
+from sqlalchemy import func, or_
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import selectinload
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
-from .models import DownloadEvent, Job, Upload, User
+from .models import DownloadEvent, Job, Upload, User, utc_now
 from .schemas import (
     DownloadLogRequest,
     DownloadLogResponse,
     JobStatus,
     JobStatusUpdateRequest,
-    JobsListResponse,
     ReconstructionJob,
     UploadCreateRequest,
-    UploadListResponse,
     UploadRecord,
     UploadResponse,
     UserProfile,
 )
 
 
+# Loader option for every query whose Job entities are converted to ReconstructionJob.
+_WITH_DOWNLOAD_EVENTS = selectinload(Job.download_events)
+
+# Exactly the fields of ReconstructionJob / UploadRecord, labelled and ordered like the schemas so
+# each row maps straight onto a response dict.
+_JOB_LISTING_COLUMNS = (
+    Job.id,
+    Job.user_id.label("owner_id"),
+    Job.dataset_name,
+    Job.photo_count,
+    Job.external_job_id,
+    Job.status,
+    Job.progress,
+    Job.notes,
+    Job.model_file_name,
+    Job.created_at,
+    Job.updated_at,
+)
+_UPLOAD_LISTING_COLUMNS = (
+    Upload.id,
+    Job.id.label("job_id"),
+    Upload.dataset_name,
+    Upload.photo_count,
+    Upload.submitted_at,
+    Upload.photos_dir,
+)
+# Same IN-list size SQLAlchemy's selectinload uses.
+_IN_BATCH_SIZE = 500
+
+# Dialects with INSERT ... ON CONFLICT support; others fall back to SELECT + UPDATE/INSERT.
+_UPSERT_INSERTS = {"postgresql": postgresql_insert, "sqlite": sqlite_insert}
+
+# (email, name) last written per user id by this process. Cleared by reset(); bounded FIFO.
+_KNOWN_PROFILES: dict[str, tuple[Optional[str], Optional[str]]] = {}
+_KNOWN_PROFILES_LIMIT = 4096
+
+
 class AppStateStore:
     """
     Persistence layer backed by SQLModel + PostgreSQL (or SQLite fallback).
-    Each method expects a live SQLModel Session.
+    Each method expects a live SQLModel AsyncSession and must be awaited.
+    Sessions do not expire on commit and database-generated job timestamps come back through
+    RETURNING (eager_defaults), so committed objects are converted as they are instead of being
+    refreshed from the database.
     """
 
-    def __init__(self, session: Session) -> None:
+    __slots__ = ("session",)
+
+    def __init__(self, session: AsyncSession) -> None:
         self.session = session
 
     # ------------------------------------------------------------------ #
     # User helpers
     # ------------------------------------------------------------------ #
-    def upsert_user(self, profile: UserProfile) -> User:
-        user = self.session.get(User, profile.id)
+    async def upsert_user(self, profile: UserProfile) -> None:
+        """
+        Insert or update the user in one `INSERT ... ON CONFLICT` statement. A profile this process
+        has already written unchanged is skipped without touching the database.
+        """
+        fields = (profile.email, profile.name)
+        if _KNOWN_PROFILES.get(profile.id) == fields:
+            return
+
+        insert = _UPSERT_INSERTS.get(self.session.bind.dialect.name)
+        if insert is None:
+            await self._upsert_user_orm(profile)
+        else:
+            statement = insert(User).values(
+                id=profile.id,
+                email=profile.email,
+                name=profile.name,
+                created_at=datetime.utcnow(),
+            )
+            # Missing claims keep the stored value, as with the ORM path.
+            email = func.coalesce(statement.excluded.email, User.email)
+            name = func.coalesce(statement.excluded.name, User.name)
+            # An unchanged profile (the usual case for a returning user) matches no row here, so the
+            # database skips the write entirely instead of rewriting an identical row.
+            statement = statement.on_conflict_do_update(
+                index_elements=[User.id],
+                set_={"email": email, "name": name},
+                where=or_(User.email.is_distinct_from(email), User.name.is_distinct_from(name)),
+            )
+            await self.session.execute(statement)
+            await self.session.commit()
+
+        if len(_KNOWN_PROFILES) >= _KNOWN_PROFILES_LIMIT:
+            del _KNOWN_PROFILES[next(iter(_KNOWN_PROFILES))]
+        _KNOWN_PROFILES[profile.id] = fields
+
+    async def _upsert_user_orm(self, profile: UserProfile) -> None:
+        user = await self.session.get(User, profile.id)
         if user:
             user.email = profile.email or user.email
             user.name = profile.name or user.name
         else:
             user = User(id=profile.id, email=profile.email, name=profile.name)
             self.session.add(user)
-        self.session.commit()
-        self.session.refresh(user)
-        return user
+        await self.session.commit()
 
     # ------------------------------------------------------------------ #
     # Uploads & jobs
     # ------------------------------------------------------------------ #
-    def create_upload(self, owner_id: str, payload: UploadCreateRequest) -> UploadResponse:
+    async def create_upload(self, owner_id: str, payload: UploadCreateRequest) -> UploadResponse:
         upload = Upload(
             user_id=owner_id,
             dataset_name=payload.dataset_name,
             photo_count=payload.photo_count,
         )
 
-        self.session.add(upload)
-        self.session.flush()
-        self.session.refresh(upload)
-
+        # Primary keys are generated client-side, so both rows go out in one flush and one commit.
         job = Job(
             user_id=owner_id,
             upload_id=upload.id,
@@ -68,61 +144,118 @@ class AppStateStore:
             notes=payload.notes,
             status=JobStatus.QUEUED,
             progress=0.0,
+            download_events=[],
         )
 
-        self.session.add(job)
-        self.session.commit()
-        self.session.refresh(upload)
-        self.session.refresh(job)
+        self.session.add_all((upload, job))
+        await self.session.commit()
 
-        return UploadResponse(
+        return UploadResponse.model_construct(
             upload=self._to_upload_record(upload, job.id),
             job=self._to_reconstruction_job(job),
         )
 
-    def attach_external_job_id(self, job_id: UUID, external_job_id: str) -> ReconstructionJob:
-        job = self.get_job_entity(job_id)
+    async def attach_external_job_id(self, job_id: UUID, external_job_id: str) -> ReconstructionJob:
+        job = await self.get_job_entity(job_id)
         job.external_job_id = external_job_id
         self.session.add(job)
-        self.session.commit()
-        self.session.refresh(job)
+        await self.session.commit()
         return self._to_reconstruction_job(job)
 
-    def list_uploads(self, owner_id: Optional[str] = None) -> UploadListResponse:
-        query = select(Upload)
+    async def list_uploads_payload(
+        self, owner_id: Optional[str] = None, limit: Optional[int] = None
+    ) -> dict[str, list[dict[str, Any]]]:
+        """
+        Uploads as plain dicts shaped like UploadListResponse, ready for orjson. Listings skip
+        Pydantic models entirely; the route keeps response_model only for the OpenAPI schema.
+        """
+        # Every upload is created together with its job, so an inner join returns each upload once.
+        query = select(*_UPLOAD_LISTING_COLUMNS).join(Job, Job.upload_id == Upload.id)
         if owner_id:
             query = query.where(Upload.user_id == owner_id)
 
-        uploads = self.session.exec(query.order_by(Upload.submitted_at.desc())).all()
-        return UploadListResponse(
-            uploads=[self._to_upload_record(upload, self._job_id_for_upload(upload.id)) for upload in uploads]
-        )
+        query = query.order_by(Upload.submitted_at.desc())
+        if limit is not None:
+            query = query.limit(limit)
+        rows = (await self.session.exec(query)).all()
+        return {"uploads": [row._asdict() for row in rows]}
 
-    def list_jobs(self, owner_id: Optional[str] = None, status: Optional[JobStatus] = None) -> JobsListResponse:
-        query = select(Job)
+    async def list_jobs_payload(
+        self,
+        owner_id: Optional[str] = None,
+        status: Optional[JobStatus] = None,
+        limit: Optional[int] = None,
+    ) -> dict[str, list[dict[str, Any]]]:
+        """
+        Jobs as plain dicts shaped like JobsListResponse, built from column tuples rather than Job
+        entities (no ORM hydration, no identity map, no Pydantic models). The download events of
+        the whole page are loaded in batched IN queries.
+        """
+        query = select(*_JOB_LISTING_COLUMNS)
         if owner_id:
             query = query.where(Job.user_id == owner_id)
         if status:
             query = query.where(Job.status == status)
 
-        jobs = self.session.exec(query.order_by(Job.created_at.desc())).all()
-        return JobsListResponse(jobs=[self._to_reconstruction_job(job) for job in jobs])
+        query = query.order_by(Job.created_at.desc())
+        if limit is not None:
+            query = query.limit(limit)
+        rows = (await self.session.exec(query)).all()
 
-    def get_job(self, job_id: UUID) -> ReconstructionJob:
-        job = self.session.get(Job, job_id)
-        if not job:
-            raise KeyError(f"Job {job_id} not found")
+        jobs: list[dict[str, Any]] = []
+        events: dict[UUID, list[datetime]] = {}
+        for row in rows:
+            job = row._asdict()
+            job["download_events"] = events[row.id] = []
+            jobs.append(job)
+
+        job_ids = list(events)
+        for start in range(0, len(job_ids), _IN_BATCH_SIZE):
+            batch = job_ids[start : start + _IN_BATCH_SIZE]
+            event_rows = await self.session.exec(
+                select(DownloadEvent.job_id, DownloadEvent.timestamp)
+                .where(DownloadEvent.job_id.in_(batch))
+                .order_by(DownloadEvent.timestamp)
+            )
+            for job_id, timestamp in event_rows:
+                events[job_id].append(timestamp)
+
+        return {"jobs": jobs}
+
+    async def get_job(self, job_id: UUID) -> ReconstructionJob:
+        return self._to_reconstruction_job(await self.get_job_entity(job_id))
+
+    async def get_owned_job(self, job_id: UUID, owner_id: str) -> ReconstructionJob:
+        """Raises KeyError if the job does not exist and PermissionError if another user owns it."""
+        job = await self.get_job_entity(job_id)
+        if job.user_id != owner_id:
+            raise PermissionError(f"Job {job_id} belongs to another user")
         return self._to_reconstruction_job(job)
 
-    def get_job_entity(self, job_id: UUID) -> Job:
-        job = self.session.get(Job, job_id)
+    async def get_job_entity(self, job_id: UUID) -> Job:
+        """Load a job together with its download events."""
+        job = await self.session.get(Job, job_id, options=[_WITH_DOWNLOAD_EVENTS])
         if not job:
             raise KeyError(f"Job {job_id} not found")
         return job
 
-    def update_job(self, job_id: UUID, payload: JobStatusUpdateRequest) -> ReconstructionJob:
-        job = self.get_job_entity(job_id)
+    async def update_job(self, job_id: UUID, payload: JobStatusUpdateRequest) -> ReconstructionJob:
+        job = await self.get_job_entity(job_id)
+        self._apply_job_update(job, payload)
+        await self.session.commit()
+        return self._to_reconstruction_job(job)
 
+    async def stage_job_update(self, job_id: UUID, payload: JobStatusUpdateRequest) -> None:
+        """
+        Apply an update inside the current transaction without committing or loading download
+        events; the caller commits once for a whole batch (see the simulator's session_scope).
+        """
+        job = await self.session.get(Job, job_id)
+        if not job:
+            raise KeyError(f"Job {job_id} not found")
+        self._apply_job_update(job, payload)
+
+    def _apply_job_update(self, job: Job, payload: JobStatusUpdateRequest) -> None:
         if payload.status is not None:
             job.status = payload.status
         if payload.progress is not None:
@@ -134,57 +267,54 @@ class AppStateStore:
         if payload.notes is not None:
             job.notes = payload.notes
 
-        job.updated_at = datetime.utcnow()
+        # Stamped explicitly: the column's onupdate only fires on a net change, but clients treat
+        # updated_at as a heartbeat, so re-sending the current status must still bump it.
+        job.updated_at = utc_now()
         self.session.add(job)
-        self.session.commit()
-        self.session.refresh(job)
-        return self._to_reconstruction_job(job)
 
-    def log_download(self, request: DownloadLogRequest) -> DownloadLogResponse:
-        job = self.get_job_entity(request.job_id)
-        download = DownloadEvent(job_id=job.id)
-        self.session.add(download)
+    async def log_download(self, request: DownloadLogRequest) -> DownloadLogResponse:
+        job = await self.get_job_entity(request.job_id)
+        job.download_events.append(DownloadEvent(job_id=job.id))
 
-        job.updated_at = datetime.utcnow()
+        # Only a DownloadEvent row is added, so the job's UPDATE has to be forced explicitly.
+        job.updated_at = utc_now()
         self.session.add(job)
-        self.session.commit()
-        self.session.refresh(job)
-        return DownloadLogResponse(job=self._to_reconstruction_job(job))
+        await self.session.commit()
+        return DownloadLogResponse.model_construct(job=self._to_reconstruction_job(job))
 
-    def update_upload_media(self, upload_id: UUID, *, photo_count: int, photos_dir: str) -> UploadRecord:
-        upload = self.session.get(Upload, upload_id)
+    async def update_upload_media(self, upload_id: UUID, *, photo_count: int, photos_dir: str) -> UploadRecord:
+        upload = await self.session.get(Upload, upload_id)
         if not upload:
             raise KeyError(f"Upload {upload_id} not found")
         upload.photo_count = photo_count
         upload.photos_dir = photos_dir
-        job_id = self._job_id_for_upload(upload_id)
+        job_id = await self._job_id_for_upload(upload_id)
         self.session.add(upload)
-        job = self.session.get(Job, job_id)
+        job = await self.session.get(Job, job_id)
         if job:
             job.photo_count = photo_count
             self.session.add(job)
-        self.session.commit()
-        self.session.refresh(upload)
+        await self.session.commit()
         return self._to_upload_record(upload, job_id)
 
-    def reset(self) -> None:
+    async def reset(self) -> None:
         from sqlmodel import delete
 
-        self.session.exec(delete(DownloadEvent))
-        self.session.exec(delete(Job))
-        self.session.exec(delete(Upload))
-        self.session.exec(delete(User))
-        self.session.commit()
+        await self.session.exec(delete(DownloadEvent))
+        await self.session.exec(delete(Job))
+        await self.session.exec(delete(Upload))
+        await self.session.exec(delete(User))
+        await self.session.commit()
+        _KNOWN_PROFILES.clear()
 
     # ------------------------------------------------------------------ #
     # Converters
     # ------------------------------------------------------------------ #
+    # Converters build response models with model_construct: the values come typed from the ORM and
+    # were validated when they were written, so per-row Pydantic validation is skipped.
     def _to_reconstruction_job(self, job: Job) -> ReconstructionJob:
-        events = self.session.exec(
-            select(DownloadEvent.timestamp).where(DownloadEvent.job_id == job.id).order_by(DownloadEvent.timestamp.asc())
-        ).all()
-
-        return ReconstructionJob(
+        """Expects `job.download_events` to be loaded (see _WITH_DOWNLOAD_EVENTS)."""
+        return ReconstructionJob.model_construct(
             id=job.id,
             owner_id=job.user_id,
             dataset_name=job.dataset_name,
@@ -196,11 +326,11 @@ class AppStateStore:
             model_file_name=job.model_file_name,
             created_at=job.created_at,
             updated_at=job.updated_at,
-            download_events=events,
+            download_events=[event.timestamp for event in job.download_events],
         )
 
     def _to_upload_record(self, upload: Upload, job_id: UUID) -> UploadRecord:
-        return UploadRecord(
+        return UploadRecord.model_construct(
             id=upload.id,
             job_id=job_id,
             dataset_name=upload.dataset_name,
@@ -209,8 +339,8 @@ class AppStateStore:
             photos_dir=upload.photos_dir,
         )
 
-    def _job_id_for_upload(self, upload_id: UUID) -> UUID:
-        job_id = self.session.exec(select(Job.id).where(Job.upload_id == upload_id)).first()
+    async def _job_id_for_upload(self, upload_id: UUID) -> UUID:
+        job_id = (await self.session.exec(select(Job.id).where(Job.upload_id == upload_id))).first()
         if not job_id:
             raise KeyError(f"No job found for upload {upload_id}")
         return job_id
@@ -1,56 +1,231 @@
 from __future__ import annotations
 
+import hashlib
+import io
+import os
 import shutil
+import threading
 import urllib.request
+from contextlib import contextmanager
 from urllib.parse import urlparse
 from pathlib import Path
-from typing import Iterable
-from PIL import Image
+from typing import BinaryIO, Iterable, Iterator
+from uuid import uuid4
 
-from .supabase_storage import SupabaseStorageClient
+from .supabase_storage import SupabaseStorageClient, format_object_uri
 
 class StoragePaths:
     UPLOADS_DIR = Path("data/uploads")
     MODELS_DIR = Path("data/models")
     WORK_DIR = Path("data/work")
+    STAGING_DIR = Path("data/uploads/.staging")
+    # Content-addressed index of stored photos; job folders hard-link into it. A blob whose only
+    # remaining link is its own is dropped by LocalStorageService.reclaim_photo_blobs().
+    PHOTO_BLOBS_DIR = Path("data/uploads/.blobs")
 
     @classmethod
     def ensure_dirs(cls) -> None:
         cls.UPLOADS_DIR.mkdir(parents=True, exist_ok=True)
+        cls.STAGING_DIR.mkdir(parents=True, exist_ok=True)
+        cls.PHOTO_BLOBS_DIR.mkdir(parents=True, exist_ok=True)
         cls.MODELS_DIR.mkdir(parents=True, exist_ok=True)
         cls.WORK_DIR.mkdir(parents=True, exist_ok=True)
 
 
+_WORK_ROOT = StoragePaths.WORK_DIR.resolve()
+
+
+def _copy_in_kernel(source: BinaryIO, target: BinaryIO) -> bool:
+    """
+    Copy a disk-backed upload with os.sendfile so the bytes never pass through userspace.
+    Returns False when the source is still an in-memory spool (or sendfile is unavailable),
+    in which case the caller falls back to a buffered copy.
+    """
+    # Same check Starlette uses: SpooledTemporaryFile only has a real fd once it has rolled to disk.
+    if not hasattr(os, "sendfile") or not getattr(source, "_rolled", True):
+        return False
+    try:
+        in_fd, out_fd = source.fileno(), target.fileno()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return False
+
+    remaining = os.fstat(in_fd).st_size
+    offset = 0
+    while remaining > 0:
+        sent = os.sendfile(out_fd, in_fd, offset, remaining)
+        if sent == 0:
+            break
+        offset += sent
+        remaining -= sent
+    return True
+
+
+@contextmanager
+def _atomic_target(target: Path) -> Iterator[Path]:
+    """
+    Yield a temporary sibling of `target` to write into; it replaces `target` in one rename once the
+    block succeeds, so readers (and downloads) never see a half-written model file.
+    """
+    tmp = target.with_name(f".{target.name}.{uuid4().hex}.tmp")
+    try:
+        yield tmp
+        os.replace(tmp, target)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+
+def _copy_file(source: Path, target: Path) -> None:
+    """
+    copy2 equivalent that first tries copy_file_range, which shares extents (reflink) on Btrfs/XFS
+    and otherwise copies inside the kernel; shutil's sendfile-based copy is the fallback.
+    """
+    copied = False
+    if hasattr(os, "copy_file_range"):
+        try:
+            with open(source, "rb") as src, open(target, "wb") as dst:
+                remaining = os.fstat(src.fileno()).st_size
+                while remaining > 0:
+                    sent = os.copy_file_range(src.fileno(), dst.fileno(), remaining)
+                    if sent == 0:
+                        break
+                    remaining -= sent
+                copied = remaining == 0
+        except OSError:
+            copied = False
+    if not copied:
+        shutil.copyfile(source, target)
+    shutil.copystat(source, target)
+
+
+_COPY_BUFFER_SIZE = 1 << 20
+_copy_buffers = threading.local()
+
+
+def _copy_stream(source: BinaryIO, target: BinaryIO) -> None:
+    """
+    Buffered copy through one reusable 1 MiB buffer per thread (the io pool's threads keep theirs),
+    rather than the fresh chunk shutil.copyfileobj allocates for every read. Sources without
+    readinto (SpooledTemporaryFile before Python 3.11) fall back to copyfileobj.
+    """
+    readinto = getattr(source, "readinto", None)
+    if readinto is None:
+        shutil.copyfileobj(source, target, _COPY_BUFFER_SIZE)
+        return
+
+    buffer = getattr(_copy_buffers, "buffer", None)
+    if buffer is None:
+        buffer = _copy_buffers.buffer = bytearray(_COPY_BUFFER_SIZE)
+    view = memoryview(buffer)
+    while count := readinto(buffer):
+        target.write(view[:count])
+
+
 class LocalStorageService:
     def __init__(self, supabase_client: SupabaseStorageClient | None = None) -> None:
         StoragePaths.ensure_dirs()
         self.supabase = supabase_client
 
-    def save_photos(self, job_id: str, images: Iterable[Image.Image]) -> tuple[str, list[str]]:
+    def stage_uploads(self, sources: Iterable[BinaryIO]) -> tuple[Path, list[Path]]:
+        """
+        Copy uploaded file objects chunk by chunk into a fresh staging directory so photos never
+        have to be held in memory. Returns the staging directory and the staged file paths.
+        """
+        staging_dir = StoragePaths.STAGING_DIR / uuid4().hex
+        staging_dir.mkdir(parents=True, exist_ok=True)
+
+        staged: list[Path] = []
+        try:
+            for index, source in enumerate(sources, start=1):
+                target = staging_dir / f"upload_{index:03d}"
+                source.seek(0)
+                with open(target, "wb") as fp:
+                    if not _copy_in_kernel(source, fp):
+                        _copy_stream(source, fp)
+                staged.append(target)
+        except BaseException:
+            # The caller never sees staging_dir on failure, so it cannot clean it up itself.
+            self.discard_staging(staging_dir)
+            raise
+        return staging_dir, staged
+
+    def discard_staging(self, staging_dir: Path) -> None:
+        shutil.rmtree(staging_dir, ignore_errors=True)
+
+    def photo_targets(self, job_id: str, count: int) -> tuple[Path, list[Path]]:
+        """Create data/uploads/<job_id>/ and return it with the photo_###.jpg paths for `count` photos."""
         job_dir = StoragePaths.UPLOADS_DIR / job_id
         job_dir.mkdir(parents=True, exist_ok=True)
+        return job_dir, [job_dir / f"photo_{index:03d}.jpg" for index in range(1, count + 1)]
+
+    def store_photo(self, staged: Path, target: Path) -> None:
+        """
+        Move one validated staged photo to `target`. Each photo is stored once under its BLAKE2b
+        digest and hard-linked into the job folder, so re-uploaded photos (overlapping datasets,
+        retries) do not take extra disk space. Photos are independent, so callers may store an
+        upload's photos concurrently.
+        """
+        hasher = hashlib.blake2b()
+        with open(staged, "rb") as fp:
+            # Chunked update rather than hashlib.file_digest, which needs Python 3.11.
+            for chunk in iter(lambda: fp.read(1 << 20), b""):
+                hasher.update(chunk)
+        digest = hasher.hexdigest()
+        blob = StoragePaths.PHOTO_BLOBS_DIR / digest[:2] / f"{digest}.jpg"
 
-        saved_paths: list[str] = []
-        for index, image in enumerate(images, start=1):
-            filename = job_dir / f"photo_{index:03d}.jpg"
-            image.save(filename, format="JPEG", quality=90)
-            saved_paths.append(str(filename))
+        # The photo lands in the job folder first, so reclaim_photo_blobs() can never take the only
+        # copy. Stored photos are read-only: a shared inode edited in place would change every job.
+        staged.replace(target)
+        os.chmod(target, 0o444)
+        try:
+            blob.parent.mkdir(exist_ok=True)
+            try:
+                with _atomic_target(target) as tmp:
+                    os.link(blob, tmp)
+            except FileNotFoundError:
+                os.link(target, blob)
+        except OSError:
+            # No hard links on this filesystem (or a concurrent save won the race): keep the plain copy.
+            pass
 
-        return str(job_dir), saved_paths
+    def reclaim_photo_blobs(self) -> int:
+        """
+        Unlink stored photo blobs that no job folder links to any more (st_nlink == 1), so deleting
+        data/uploads/<job_id> frees its unique photos. Returns the number of blobs removed.
+        """
+        removed = 0
+        try:
+            shards = [entry.path for entry in os.scandir(StoragePaths.PHOTO_BLOBS_DIR) if entry.is_dir()]
+        except FileNotFoundError:
+            return 0
+        for shard in shards:
+            with os.scandir(shard) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_file(follow_symlinks=False) and entry.stat().st_nlink == 1:
+                            os.unlink(entry.path)
+                            removed += 1
+                    except FileNotFoundError:
+                        continue
+        return removed
 
     def save_model_placeholder(self, job_id: str, content: bytes = b"") -> str:
         model_path = StoragePaths.MODELS_DIR / f"{job_id}.glb"
-        model_path.write_bytes(content)
+        with _atomic_target(model_path) as tmp:
+            tmp.write_bytes(content)
         return self._maybe_upload_model(job_id, model_path)
 
     def prepare_work_dir(self, job_id: str) -> Path:
         work_dir = StoragePaths.WORK_DIR / job_id
-        if work_dir.exists():
-            for path in work_dir.glob("*"):
-                if path.is_dir():
-                    shutil.rmtree(path)
-                else:
-                    path.unlink()
+        try:
+            # DirEntry caches the file type from readdir, so the wipe needs no per-entry stat.
+            with os.scandir(work_dir) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        shutil.rmtree(entry.path)
+                    else:
+                        os.unlink(entry.path)
+        except FileNotFoundError:
+            pass
         work_dir.mkdir(parents=True, exist_ok=True)
         return work_dir
 
@@ -58,8 +233,20 @@ class LocalStorageService:
         target_dir = StoragePaths.MODELS_DIR / job_id
         target_dir.mkdir(parents=True, exist_ok=True)
         target_path = target_dir / source_path.name
-        if source_path.resolve() != target_path.resolve():
-            shutil.copy2(source_path, target_path)
+        source = source_path.resolve()
+        if source != target_path.resolve():
+            # Artifacts produced in our own work dir are scratch files: move them (a metadata-only
+            # rename on the same filesystem). Anything else is the caller's file and gets copied.
+            moved = False
+            if source.is_relative_to(_WORK_ROOT):
+                try:
+                    os.replace(source, target_path)
+                    moved = True
+                except OSError:
+                    pass
+            if not moved:
+                with _atomic_target(target_path) as tmp:
+                    _copy_file(source, tmp)
         return self._maybe_upload_model(job_id, target_path)
 
     def ingest_artifact_from_uri(self, job_id: str, uri: str, timeout: int = 30) -> str:
@@ -81,9 +268,10 @@ class LocalStorageService:
             work_dir = self.prepare_work_dir(job_id)
             filename = Path(parsed.path).name or "model.glb"
             target = work_dir / filename
-            with urllib.request.urlopen(uri, timeout=timeout) as response:
-                data = response.read()
-            target.write_bytes(data)
+            # Streamed to disk in 1 MiB chunks so multi-GB models are never held in memory.
+            with _atomic_target(target) as tmp:
+                with urllib.request.urlopen(uri, timeout=timeout) as response, open(tmp, "wb") as fp:
+                    _copy_stream(response, fp)
             return self.persist_model_artifact(job_id, target)
 
         raise ValueError(f"Unsupported artifact URI scheme: {parsed.scheme or 'unknown'}")
@@ -98,7 +286,7 @@ class LocalStorageService:
         object_key = f"models/{job_id}/{local_path.name}"
         try:
             self.supabase.upload_file(object_key, file_path=str(local_path))
-            return f"supabase://{self.supabase.config.bucket}/{object_key}"
+            return format_object_uri(self.supabase.config.bucket, object_key)
         except Exception:
             # Fallback to local path if upload fails; pipeline should not crash.
             return str(local_path)
@@ -1,11 +1,31 @@
 from __future__ import annotations
 
-import json
+import functools
 import os
 from dataclasses import dataclass
 from typing import Optional
 
 import httpx
+import orjson
+
+OBJECT_URI_PREFIX = "supabase://"
+
+
+def format_object_uri(bucket: str, object_key: str) -> str:
+    """Build the `supabase://bucket/key` reference stored in Job.model_file_name."""
+    return f"{OBJECT_URI_PREFIX}{bucket}/{object_key}"
+
+
+@functools.lru_cache(maxsize=1024)
+def parse_object_uri(uri: str) -> tuple[str, str]:
+    """
+    Split a `supabase://bucket/key` reference into (bucket, key). Stored references never change,
+    so repeated downloads of the same model reuse the parsed tuple. Raises ValueError if malformed.
+    """
+    bucket, separator, key = uri.removeprefix(OBJECT_URI_PREFIX).partition("/")
+    if not separator or not bucket:
+        raise ValueError(f"Invalid Supabase object URI: {uri}")
+    return bucket, key
 
 
 @dataclass
@@ -32,15 +52,28 @@ class SupabaseStorageClient:
 
     def __init__(self, config: SupabaseStorageConfig) -> None:
         self.config = config
-        self._client = httpx.Client(timeout=30)
+        self._client: Optional[httpx.Client] = None
+        self.open()
+
+    def open(self) -> None:
+        """(Re)create the HTTP client after close(); the app calls this on every startup."""
+        if self._client is not None and not self._client.is_closed:
+            return
+        # Uploads and signed-URL requests for one artifact arrive back to back; keep connections
+        # (and their TLS sessions) alive between them instead of httpx's 5 s default.
+        self._client = httpx.Client(
+            timeout=30,
+            limits=httpx.Limits(max_keepalive_connections=8, keepalive_expiry=60.0),
+        )
+
+    def close(self) -> None:
+        self._client.close()
 
     def upload_file(self, object_path: str, *, file_path: str, content_type: str = "application/octet-stream") -> str:
         """
         Upload a local file to Supabase Storage. Returns the stored object key (path inside the bucket).
+        The file is streamed from disk, so large models are never read into memory.
         """
-        with open(file_path, "rb") as fp:
-            data = fp.read()
-
         endpoint = f"{self.config.url}/storage/v1/object/{self.config.bucket}/{object_path.lstrip('/')}"
         headers = {
             "Authorization": f"Bearer {self.config.service_key}",
@@ -49,7 +82,9 @@ class SupabaseStorageClient:
             "x-upsert": "true",
         }
 
-        response = self._client.put(endpoint, content=data, headers=headers)
+        with open(file_path, "rb") as fp:
+            headers["Content-Length"] = str(os.fstat(fp.fileno()).st_size)
+            response = self._client.put(endpoint, content=fp, headers=headers)
         if response.status_code not in (200, 201):
             raise RuntimeError(f"Supabase upload failed ({response.status_code}): {response.text}")
         return object_path
@@ -65,11 +100,14 @@ class SupabaseStorageClient:
             "Content-Type": "application/json",
         }
         payload = {"expiresIn": expires_in}
-        response = self._client.post(endpoint, headers=headers, content=json.dumps(payload))
+        response = self._client.post(endpoint, headers=headers, content=orjson.dumps(payload))
         if response.status_code != 200:
             raise RuntimeError(f"Supabase sign URL failed ({response.status_code}): {response.text}")
 
-        data = response.json()
+        try:
+            data = orjson.loads(response.content)
+        except orjson.JSONDecodeError as exc:
+            raise RuntimeError("Supabase sign URL returned invalid JSON") from exc
         signed_url = data.get("signedURL") or data.get("signedUrl")
         if not signed_url:
             raise RuntimeError("Supabase sign URL missing signedURL field")
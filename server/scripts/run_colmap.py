@@ -8,7 +8,7 @@ It is designed to be invoked by the backend via the `RECONSTRUCTION_COMMAND` tem
 
 The script attempts to:
 1. Extract features using COLMAP.
-2. Perform exhaustive matching.
+2. Match features (exhaustive for small sets, sequential for long walk-around captures).
 3. Reconstruct a sparse model (mapper).
 4. Convert the sparse reconstruction to a PLY mesh (`model.ply`).
 
@@ -34,20 +34,27 @@ def log(message: str) -> None:
 
 
 def run_command(command: list[str], cwd: Path | None = None) -> None:
-    """Execute a subprocess and raise on failure with detailed output."""
+    """
+    Execute a subprocess and raise on failure. Output is forwarded line by line as it is produced,
+    so COLMAP's progress shows up live and is never buffered in memory.
+    """
     log(f"Running: {' '.join(command)}")
-    process = subprocess.run(
+    with subprocess.Popen(
         command,
         cwd=str(cwd) if cwd else None,
-        check=False,
         stdout=subprocess.PIPE,
         stderr=subprocess.STDOUT,
-    )
-    output = process.stdout.decode(errors="ignore")
-    if output:
-        log(output)
-    if process.returncode != 0:
-        raise RuntimeError(f"Command failed with exit code {process.returncode}: {' '.join(command)}")
+        text=True,
+        errors="replace",
+        bufsize=1,
+    ) as process:
+        for line in process.stdout:
+            line = line.rstrip()
+            if line:
+                log(line)
+        returncode = process.wait()
+    if returncode != 0:
+        raise RuntimeError(f"Command failed with exit code {returncode}: {' '.join(command)}")
 
 
 def ensure_colmap_available(executable: str | None = None) -> str | None:
@@ -74,7 +81,61 @@ def generate_placeholder_model(output_dir: Path, job_id: str) -> Path:
     return model_path
 
 
-def run_colmap_pipeline(colmap_bin: str, input_dir: Path, output_dir: Path, job_id: str) -> Path:
+MATCHERS = ("auto", "exhaustive", "sequential", "vocab_tree")
+# Exhaustive matching is O(N^2) in the image count; above this many photos `auto` switches to
+# sequential matching, which suits the walk-around captures the app produces.
+AUTO_SEQUENTIAL_MIN_IMAGES = 80
+SEQUENTIAL_OVERLAP = 10
+
+
+def gpu_available(mode: str) -> bool:
+    """Resolve --use-gpu: `auto` enables CUDA SIFT when an NVIDIA driver (nvidia-smi) is present."""
+    if mode == "auto":
+        return shutil.which("nvidia-smi") is not None
+    return mode == "on"
+
+
+def gpu_flags(section: str, use_gpu: bool, gpu_index: str) -> list[str]:
+    """SiftExtraction/SiftMatching GPU options; always explicit so CPU-only hosts never try a GPU context."""
+    flags = [f"--{section}.use_gpu", "1" if use_gpu else "0"]
+    if use_gpu:
+        flags += [f"--{section}.gpu_index", gpu_index]
+    return flags
+
+
+def matcher_command(
+    colmap_bin: str,
+    database_path: Path,
+    matcher: str,
+    image_count: int,
+    vocab_tree: str | None,
+    gpu: list[str] | None = None,
+) -> list[str]:
+    """Build the COLMAP matching command for the requested (or automatically chosen) matcher."""
+    if matcher == "auto":
+        matcher = "sequential" if image_count > AUTO_SEQUENTIAL_MIN_IMAGES else "exhaustive"
+    log(f"Using {matcher} matcher for {image_count} images")
+
+    command = [colmap_bin, f"{matcher}_matcher", "--database_path", str(database_path)]
+    if matcher == "sequential":
+        command += ["--SequentialMatching.overlap", str(SEQUENTIAL_OVERLAP)]
+    elif matcher == "vocab_tree":
+        if not vocab_tree:
+            raise RuntimeError("vocab_tree matcher needs --vocab-tree (or COLMAP_VOCAB_TREE) set to a vocabulary file.")
+        command += ["--VocabTreeMatching.vocab_tree_path", vocab_tree]
+    return command + (gpu or [])
+
+
+def run_colmap_pipeline(
+    colmap_bin: str,
+    input_dir: Path,
+    output_dir: Path,
+    job_id: str,
+    matcher: str = "auto",
+    vocab_tree: str | None = None,
+    use_gpu: bool = False,
+    gpu_index: str = "0",
+) -> Path:
     workspace = output_dir / "colmap_workspace"
     if workspace.exists():
         shutil.rmtree(workspace)
@@ -93,17 +154,21 @@ def run_colmap_pipeline(colmap_bin: str, input_dir: Path, output_dir: Path, job_
             str(database_path),
             "--image_path",
             str(input_dir),
+            *gpu_flags("SiftExtraction", use_gpu, gpu_index),
         ]
     )
 
     # Step 2: matching
+    image_count = sum(1 for entry in os.scandir(input_dir) if entry.is_file())
     run_command(
-        [
+        matcher_command(
             colmap_bin,
-            "exhaustive_matcher",
-            "--database_path",
-            str(database_path),
-        ]
+            database_path,
+            matcher,
+            image_count,
+            vocab_tree,
+            gpu=gpu_flags("SiftMatching", use_gpu, gpu_index),
+        )
     )
 
     # Step 3: mapping (sparse reconstruction)
@@ -148,6 +213,24 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--output", required=True, help="Directory where the reconstructed model should be placed.")
     parser.add_argument("--job", default="", help="Job identifier (for logging purposes).")
     parser.add_argument("--colmap-binary", default=None, help="Optional path to the COLMAP executable.")
+    parser.add_argument(
+        "--matcher",
+        choices=MATCHERS,
+        default=os.getenv("COLMAP_MATCHER", "auto"),
+        help=f"Feature matcher; 'auto' uses sequential matching above {AUTO_SEQUENTIAL_MIN_IMAGES} photos.",
+    )
+    parser.add_argument(
+        "--vocab-tree",
+        default=os.getenv("COLMAP_VOCAB_TREE"),
+        help="Vocabulary tree file for the vocab_tree matcher (e.g. vocab_tree_flickr100K_words32K.bin).",
+    )
+    parser.add_argument(
+        "--use-gpu",
+        choices=("auto", "on", "off"),
+        default=os.getenv("COLMAP_USE_GPU", "auto"),
+        help="Run SIFT extraction and matching on the GPU; 'auto' checks for nvidia-smi.",
+    )
+    parser.add_argument("--gpu-index", default=os.getenv("COLMAP_GPU", "0"), help="CUDA device index for COLMAP.")
     return parser.parse_args()
 
 
@@ -172,7 +255,16 @@ def main() -> int:
         return 0
 
     try:
-        model_path = run_colmap_pipeline(colmap_bin, input_dir, output_dir, job_id)
+        model_path = run_colmap_pipeline(
+            colmap_bin,
+            input_dir,
+            output_dir,
+            job_id,
+            matcher=args.matcher,
+            vocab_tree=args.vocab_tree,
+            use_gpu=gpu_available(args.use_gpu),
+            gpu_index=args.gpu_index,
+        )
     except Exception as exc:  # noqa: BLE001
         log(f"COLMAP pipeline failed: {exc}")
         placeholder = generate_placeholder_model(output_dir, job_id)
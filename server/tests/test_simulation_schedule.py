@@ -0,0 +1,23 @@
+import unittest
+from uuid import uuid4
+
+from app import main
+
+
+class SimulationScheduleTests(unittest.IsolatedAsyncioTestCase):
+    async def test_rescheduling_invalidates_pending_steps(self) -> None:
+        runner = main.ReconstructionRunner(main.storage_service, None)
+        runner.allow_simulation = True
+        runner.command_template = None
+        self.addAsyncCleanup(runner.aclose)
+        job_id = uuid4()
+
+        runner.schedule(job_id, "dataset", "/photos", 1, None)
+        runner.schedule(job_id, "dataset", "/photos", 1, None)
+
+        live = [entry for entry in runner._heap if entry[1] == job_id and entry[3] == runner._generations[job_id]]
+        self.assertEqual(len(live), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import asyncio
+import unittest
+from contextlib import asynccontextmanager
+from unittest import mock
+from uuid import uuid4
+
+from app import main
+from app.schemas import JobStatusUpdateRequest
+
+
+class _RecordingStore:
+    """Stands in for AppStateStore; each staged update takes `delay` seconds to write."""
+
+    writes: list = []
+    delay = 0.0
+
+    def __init__(self, session) -> None:
+        pass
+
+    async def stage_job_update(self, job_id, payload) -> None:
+        await asyncio.sleep(self.delay)
+        self.writes.append((job_id, payload.progress))
+
+
+@asynccontextmanager
+async def _fake_session_scope():
+    yield None
+
+
+class JobUpdateCoalescerTests(unittest.IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        _RecordingStore.writes = []
+        _RecordingStore.delay = 0.0
+        for target, replacement in (("session_scope", _fake_session_scope), ("AppStateStore", _RecordingStore)):
+            patcher = mock.patch.object(main, target, replacement)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    async def test_updates_are_merged_and_flushed_once(self) -> None:
+        coalescer = main.JobUpdateCoalescer(0.01)
+        job_id = uuid4()
+        coalescer.submit(job_id, JobStatusUpdateRequest(progress=0.2))
+        coalescer.submit(job_id, JobStatusUpdateRequest(progress=0.3))
+        await asyncio.sleep(0.05)
+        self.assertEqual(_RecordingStore.writes, [(job_id, 0.3)])
+
+    async def test_submit_during_flush_is_flushed_without_another_callback(self) -> None:
+        coalescer = main.JobUpdateCoalescer(0.01)
+        _RecordingStore.delay = 0.1
+        job_a, job_b = uuid4(), uuid4()
+        coalescer.submit(job_a, JobStatusUpdateRequest(progress=0.2))
+        await asyncio.sleep(0.05)  # the flusher is now inside the slow write for job A
+        coalescer.submit(job_b, JobStatusUpdateRequest(progress=0.4))
+        await asyncio.sleep(0.4)
+        self.assertEqual(_RecordingStore.writes, [(job_a, 0.2), (job_b, 0.4)])
+        self.assertEqual(coalescer._pending, {})
+
+    async def test_aclose_writes_pending_and_in_flight_updates(self) -> None:
+        coalescer = main.JobUpdateCoalescer(0.01)
+        _RecordingStore.delay = 0.1
+        job_a, job_b = uuid4(), uuid4()
+        coalescer.submit(job_a, JobStatusUpdateRequest(progress=0.2))
+        await asyncio.sleep(0.05)
+        coalescer.submit(job_b, JobStatusUpdateRequest(progress=0.4))
+        await coalescer.aclose()
+        self.assertEqual(_RecordingStore.writes, [(job_a, 0.2), (job_b, 0.4)])
+
+
+if __name__ == "__main__":
+    unittest.main()